@@ -2,85 +2,137 @@
 Configuration management for AutoOps
 """
 
+import logging
 import os
-from pathlib import Path
-from typing import Optional
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
+from typing import Any, Dict, Mapping, Optional
 
-try:
-    from pydantic import BaseSettings, Field
-except ImportError:
-    # Fallback for older pydantic versions
-    from pydantic_settings import BaseSettings
-    from pydantic import Field
+from config.settings_simple import ENV_FILE, _read_env_file
 
 
-class Settings(BaseSettings):
-    """Application settings"""
-    
+_TRUE_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
+def _coerce(value: str, field_type: Any) -> Any:
+    """Convert a raw environment string to the declared field type"""
+    if field_type is bool:
+        return value.strip().lower() in _TRUE_VALUES
+    if field_type is int:
+        return int(value)
+    if field_type is float:
+        return float(value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class Settings:
+    """
+    Application settings.
+
+    Each field is read from the environment variable of the same name in
+    upper case (e.g. ``dashboard_port`` <- ``DASHBOARD_PORT``).
+    """
+
     # OpenAI Configuration
-    openai_api_key: str = Field("your_openai_api_key_here", env="OPENAI_API_KEY")
-    openai_model: str = Field("gpt-4", env="OPENAI_MODEL")
-    
+    openai_api_key: str = "your_openai_api_key_here"
+    openai_model: str = "gpt-4"
+    # OpenAI-compatible endpoint, e.g. a vLLM server with a speculative draft model
+    openai_base_url: Optional[str] = None
+
     # Kubernetes Configuration
-    kubeconfig_path: Optional[str] = Field(None, env="KUBECONFIG_PATH")
-    kubernetes_namespace: str = Field("default", env="KUBERNETES_NAMESPACE")
-    
+    kubeconfig_path: Optional[str] = None
+    kubernetes_namespace: str = "default"
+    # Client-side rate limit on API server requests (sustained QPS and burst size)
+    kubernetes_api_qps: float = 50.0
+    kubernetes_api_burst: int = 100
+
     # OpenTelemetry Configuration
-    otel_service_name: str = Field("autoops", env="OTEL_SERVICE_NAME")
-    otel_exporter_otlp_endpoint: str = Field(
-        "http://localhost:4317", env="OTEL_EXPORTER_OTLP_ENDPOINT"
-    )
-    otel_exporter_jaeger_endpoint: str = Field(
-        "http://localhost:14268/api/traces", env="OTEL_EXPORTER_JAEGER_ENDPOINT"
-    )
-    otel_resource_attributes: str = Field(
-        "service.name=autoops,service.version=1.0.0", env="OTEL_RESOURCE_ATTRIBUTES"
-    )
-    
+    otel_service_name: str = "autoops"
+    otel_exporter_otlp_endpoint: str = "http://localhost:4317"
+    otel_exporter_jaeger_endpoint: str = "http://localhost:14268/api/traces"
+    otel_resource_attributes: str = "service.name=autoops,service.version=1.0.0"
+    # Fraction of new traces to sample (child spans follow their parent's decision)
+    otel_sampling_ratio: float = 0.1
+    # Sample after the fact instead: keep all error spans plus the sampling ratio of the rest
+    otel_tail_sampling: bool = False
+    # Auto-instrumentation of the requests library and log records (trace IDs in logs)
+    otel_instrument_requests: bool = False
+    otel_instrument_logging: bool = False
+
     # Dashboard Configuration
-    dashboard_host: str = Field("0.0.0.0", env="DASHBOARD_HOST")
-    dashboard_port: int = Field(8080, env="DASHBOARD_PORT")
-    dashboard_debug: bool = Field(False, env="DASHBOARD_DEBUG")
-    
+    dashboard_host: str = "0.0.0.0"
+    dashboard_port: int = 8080
+    dashboard_debug: bool = False
+
     # Redis Configuration
-    redis_host: str = Field("localhost", env="REDIS_HOST")
-    redis_port: int = Field(6379, env="REDIS_PORT")
-    redis_db: int = Field(0, env="REDIS_DB")
-    redis_password: Optional[str] = Field(None, env="REDIS_PASSWORD")
-    
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    redis_db: int = 0
+    redis_password: Optional[str] = None
+
     # Database Configuration
-    database_url: str = Field("sqlite:///./autoops.db", env="DATABASE_URL")
-    
+    database_url: str = "sqlite:///./autoops.db"
+
     # Logging Configuration
-    log_level: str = Field("INFO", env="LOG_LEVEL")
-    log_format: str = Field("json", env="LOG_FORMAT")
-    
+    log_level: str = "INFO"
+    log_format: str = "json"
+
     # Security
-    secret_key: str = Field("development-secret-key-change-in-production", env="SECRET_KEY")
-    access_token_expire_minutes: int = Field(30, env="ACCESS_TOKEN_EXPIRE_MINUTES")
-    
+    secret_key: str = "development-secret-key-change-in-production"
+    access_token_expire_minutes: int = 30
+
     # Task Configuration
-    max_concurrent_tasks: int = Field(10, env="MAX_CONCURRENT_TASKS")
-    task_timeout_seconds: int = Field(300, env="TASK_TIMEOUT_SECONDS")
-    retry_max_attempts: int = Field(3, env="RETRY_MAX_ATTEMPTS")
-    retry_delay_seconds: float = Field(1.0, env="RETRY_DELAY_SECONDS")
-    
+    max_concurrent_tasks: int = 10
+    task_timeout_seconds: int = 300
+    retry_max_attempts: int = 3
+    retry_delay_seconds: float = 1.0
+
     # Development Settings
-    dev_mode: bool = Field(False, env="DEV_MODE")
-    reload_on_change: bool = Field(False, env="RELOAD_ON_CHANGE")
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
+    dev_mode: bool = False
+    reload_on_change: bool = False
 
+    # Derived values, computed once after construction
+    log_level_num: int = field(init=False, repr=False, compare=False)
 
-def get_settings() -> Settings:
-    """Get application settings"""
-    env_file = Path(__file__).parent / ".env"
-    if env_file.exists():
-        return Settings(_env_file=str(env_file))
-    return Settings()
+    def __post_init__(self):
+        object.__setattr__(
+            self, "log_level_num", getattr(logging, self.log_level.upper(), logging.INFO)
+        )
+
+    @classmethod
+    def _load(cls, env: Mapping[str, str]) -> "Settings":
+        """Build settings from an environment mapping, coercing each value once"""
+        values = {}
+        for f in fields(cls):
+            if not f.init:
+                continue
+            raw = env.get(f.name.upper())
+            if raw is None:
+                continue
+            if f.type == Optional[str]:
+                values[f.name] = raw or None
+            else:
+                values[f.name] = _coerce(raw, f.type)
+        return cls(**values)
+
+    def dict(self) -> Dict[str, Any]:
+        """Return settings as a dictionary (BaseSettings compatible)"""
+        return asdict(self)
 
 
-# Global settings instance
-settings = get_settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get application settings.
+
+    The settings object is built once per process; call
+    ``get_settings.cache_clear()`` to force a reload (e.g. in tests).
+    Process environment variables take precedence over the .env file.
+    """
+    file_values = _read_env_file(ENV_FILE)
+    if file_values:
+        env = dict(file_values)
+        env.update(os.environ)
+        return Settings._load(env)
+    return Settings._load(os.environ)
@@ -2,93 +2,224 @@
 Simple configuration management for AutoOps
 """
 
+import json
+import logging
+import mmap
 import os
+import re
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Mapping, Optional, Tuple
 
 
 class Settings:
-    """Application settings using environment variables"""
+    """Application settings using environment variables (or an explicit mapping)"""
     
-    def __init__(self):
+    def __init__(self, env: Optional[Mapping[str, str]] = None):
+        get = (os.environ if env is None else env).get
+        
         # OpenAI Configuration
-        self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
-        self.openai_model = os.getenv("OPENAI_MODEL", "gpt-4")
+        self.openai_api_key = get("OPENAI_API_KEY", "")
+        self.openai_model = get("OPENAI_MODEL", "gpt-4")
+        self.openai_base_url = get("OPENAI_BASE_URL") or None
         
         # Kubernetes Configuration
-        self.kubeconfig_path = os.getenv("KUBECONFIG_PATH")
-        self.kubernetes_namespace = os.getenv("KUBERNETES_NAMESPACE", "default")
+        self.kubeconfig_path = get("KUBECONFIG_PATH")
+        self.kubernetes_namespace = get("KUBERNETES_NAMESPACE", "default")
+        self.kubernetes_api_qps = float(get("KUBERNETES_API_QPS", "50"))
+        self.kubernetes_api_burst = int(get("KUBERNETES_API_BURST", "100"))
         
         # OpenTelemetry Configuration
-        self.otel_service_name = os.getenv("OTEL_SERVICE_NAME", "autoops")
-        self.otel_exporter_otlp_endpoint = os.getenv(
+        self.otel_service_name = get("OTEL_SERVICE_NAME", "autoops")
+        self.otel_exporter_otlp_endpoint = get(
             "OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4317"
         )
-        self.otel_exporter_jaeger_endpoint = os.getenv(
+        self.otel_exporter_jaeger_endpoint = get(
             "OTEL_EXPORTER_JAEGER_ENDPOINT", "http://localhost:14268/api/traces"
         )
-        self.otel_resource_attributes = os.getenv(
+        self.otel_resource_attributes = get(
             "OTEL_RESOURCE_ATTRIBUTES", "service.name=autoops,service.version=1.0.0"
         )
+        self.otel_sampling_ratio = float(get("OTEL_SAMPLING_RATIO", "0.1"))
+        self.otel_tail_sampling = get("OTEL_TAIL_SAMPLING", "false").lower() == "true"
+        self.otel_instrument_requests = get("OTEL_INSTRUMENT_REQUESTS", "false").lower() == "true"
+        self.otel_instrument_logging = get("OTEL_INSTRUMENT_LOGGING", "false").lower() == "true"
         
         # Dashboard Configuration
-        self.dashboard_host = os.getenv("DASHBOARD_HOST", "0.0.0.0")
-        self.dashboard_port = int(os.getenv("DASHBOARD_PORT", "8080"))
-        self.dashboard_debug = os.getenv("DASHBOARD_DEBUG", "false").lower() == "true"
+        self.dashboard_host = get("DASHBOARD_HOST", "0.0.0.0")
+        self.dashboard_port = int(get("DASHBOARD_PORT", "8080"))
+        self.dashboard_debug = get("DASHBOARD_DEBUG", "false").lower() == "true"
         
         # Redis Configuration
-        self.redis_host = os.getenv("REDIS_HOST", "localhost")
-        self.redis_port = int(os.getenv("REDIS_PORT", "6379"))
-        self.redis_db = int(os.getenv("REDIS_DB", "0"))
-        self.redis_password = os.getenv("REDIS_PASSWORD")
+        self.redis_host = get("REDIS_HOST", "localhost")
+        self.redis_port = int(get("REDIS_PORT", "6379"))
+        self.redis_db = int(get("REDIS_DB", "0"))
+        self.redis_password = get("REDIS_PASSWORD")
         
         # Database Configuration
-        self.database_url = os.getenv("DATABASE_URL", "sqlite:///./autoops.db")
+        self.database_url = get("DATABASE_URL", "sqlite:///./autoops.db")
         
         # Logging Configuration
-        self.log_level = os.getenv("LOG_LEVEL", "INFO")
-        self.log_format = os.getenv("LOG_FORMAT", "json")
+        self.log_level = get("LOG_LEVEL", "INFO")
+        self.log_format = get("LOG_FORMAT", "json")
+        self.log_level_num = getattr(logging, self.log_level.upper(), logging.INFO)
         
         # Security
-        self.secret_key = os.getenv("SECRET_KEY", "your-secret-key-here")
-        self.access_token_expire_minutes = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+        self.secret_key = get("SECRET_KEY", "your-secret-key-here")
+        self.access_token_expire_minutes = int(get("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
         
         # Task Configuration
-        self.max_concurrent_tasks = int(os.getenv("MAX_CONCURRENT_TASKS", "10"))
-        self.task_timeout_seconds = int(os.getenv("TASK_TIMEOUT_SECONDS", "300"))
-        self.retry_max_attempts = int(os.getenv("RETRY_MAX_ATTEMPTS", "3"))
-        self.retry_delay_seconds = float(os.getenv("RETRY_DELAY_SECONDS", "1.0"))
+        self.max_concurrent_tasks = int(get("MAX_CONCURRENT_TASKS", "10"))
+        self.task_timeout_seconds = int(get("TASK_TIMEOUT_SECONDS", "300"))
+        self.retry_max_attempts = int(get("RETRY_MAX_ATTEMPTS", "3"))
+        self.retry_delay_seconds = float(get("RETRY_DELAY_SECONDS", "1.0"))
         
         # Development Settings
-        self.dev_mode = os.getenv("DEV_MODE", "false").lower() == "true"
-        self.reload_on_change = os.getenv("RELOAD_ON_CHANGE", "false").lower() == "true"
+        self.dev_mode = get("DEV_MODE", "false").lower() == "true"
+        self.reload_on_change = get("RELOAD_ON_CHANGE", "false").lower() == "true"
 
 
+@lru_cache(maxsize=1)
 def get_settings() -> Settings:
-    """Get application settings"""
+    """
+    Get application settings.
+
+    The environment file is loaded and the settings object built once per
+    process; call ``get_settings.cache_clear()`` to force a reload.
+    """
+    load_env_file()
     return Settings()
 
 
-# Load environment file if it exists
-def load_env_file():
-    """Load environment variables from .env file"""
-    env_file = Path(__file__).parent / ".env"
-    if env_file.exists():
+# Matches KEY=VALUE lines (LF or CRLF); comment lines never match since '#' cannot start a key
+_ENV_RE = re.compile(rb"(?m)^[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*(.*?)[ \t]*\r?$")
+
+# ${VAR} references inside values
+_REF_RE = re.compile(r"\$\{([A-Za-z_][A-Za-z0-9_]*)\}")
+
+# Files above this size are scanned through mmap rather than read into memory
+_MMAP_THRESHOLD = 4096
+
+ENV_FILE = Path(__file__).parent / ".env"
+
+# Parsed env files keyed by path -> (mtime_ns, size, values)
+_ENV_CACHE: Dict[str, Tuple[int, int, Dict[str, str]]] = {}
+
+
+def parse_env_file(env_file: Path) -> Dict[str, str]:
+    """Parse an environment file into a dict with a single regex pass"""
+    values, has_refs = _scan_env_file(env_file)
+    # Interpolation is rare, so only walk the values when a reference exists
+    if has_refs:
+        _expand_references(values)
+    return values
+
+
+def _scan_env_file(env_file: Path) -> Tuple[Dict[str, str], bool]:
+    """Return the raw KEY=VALUE pairs and whether any value contains ${...}"""
+    with open(env_file, "rb") as f:
+        if os.fstat(f.fileno()).st_size <= _MMAP_THRESHOLD:
+            data = f.read()
+            return _parse_env_data(data), b"${" in data
+        # Scan large files directly over the page cache instead of copying them
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _parse_env_data(mm), mm.find(b"${") != -1
+
+
+def _parse_env_data(data) -> Dict[str, str]:
+    return {
+        match[1].decode(): match[2].decode().strip("\"'")
+        for match in _ENV_RE.finditer(data)
+    }
+
+
+def _expand_references(values: Dict[str, str]):
+    """Expand ${VAR} references in place from the environment or the file itself"""
+    environ = os.environ
+
+    def resolve(match: "re.Match[str]") -> str:
+        name = match[1]
+        return environ.get(name, values.get(name, ""))
+
+    for key, value in values.items():
+        if "${" in value:
+            values[key] = _REF_RE.sub(resolve, value)
+
+
+def _read_env_file(env_file: Path) -> Optional[Dict[str, str]]:
+    """Return the parsed env file, reparsing only when its mtime or size changes"""
+    try:
+        st = env_file.stat()
+    except FileNotFoundError:
+        return None
+
+    key = str(env_file)
+    cached = _ENV_CACHE.get(key)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    # The disk cache holds raw values; references are expanded against the
+    # current environment after loading
+    cached = _load_env_cache(env_file, st)
+    if cached is None:
+        raw, has_refs = _scan_env_file(env_file)
+        _store_env_cache(env_file, st, raw, has_refs)
+    else:
+        raw, has_refs = cached
+    
+    values = dict(raw)
+    if has_refs:
+        _expand_references(values)
+    _ENV_CACHE[key] = (st.st_mtime_ns, st.st_size, values)
+    return values
+
+
+def _env_cache_path(env_file: Path) -> Path:
+    return env_file.with_name(env_file.name + ".cache")
+
+
+def _load_env_cache(env_file: Path, st: os.stat_result) -> Optional[Tuple[Dict[str, str], bool]]:
+    """Return (raw values, has references) from the on-disk cache if it matches the env file"""
+    try:
+        with open(_env_cache_path(env_file), "rb") as f:
+            # Caches readable by others (written by older versions) are rewritten as 0600
+            if os.fstat(f.fileno()).st_mode & 0o077:
+                return None
+            cached = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict):
+        return None
+    if (cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size
+            and isinstance(cached.get("values"), dict)):
+        return cached["values"], bool(cached.get("has_refs"))
+    return None
+
+
+def _store_env_cache(env_file: Path, st: os.stat_result, values: Dict[str, str], has_refs: bool):
+    """Write the parse cache atomically; failures (e.g. read-only config) are ignored"""
+    cache_file = _env_cache_path(env_file)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    payload = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "values": values, "has_refs": has_refs}
+    try:
+        # The cache holds secrets (API keys, passwords); keep it owner-only like .env should be
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            os.fchmod(f.fileno(), 0o600)
+            f.write(json.dumps(payload))
+        os.replace(tmp_file, cache_file)
+    except OSError:
         try:
-            from dotenv import load_dotenv
-            load_dotenv(str(env_file))
-        except ImportError:
-            # dotenv not available, manually parse
-            with open(env_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        os.environ.setdefault(key.strip(), value.strip())
-
-
-# Load environment file
-load_env_file()
-
-# Global settings instance
-settings = get_settings()
+            tmp_file.unlink()
+        except OSError:
+            pass
+
+
+def load_env_file(env_file: Path = ENV_FILE):
+    """Load environment variables from .env file without overriding existing ones"""
+    values = _read_env_file(env_file)
+    if values:
+        environ = os.environ
+        for key, value in values.items():
+            if key not in environ:
+                environ[key] = value
@@ -72,22 +72,15 @@ async def example_task_manager():
         
         # Monitor task progress
         print("\nMonitoring task progress...")
-        completed_tasks = set()
         
-        while len(completed_tasks) < len(tasks):
-            for task_id in tasks:
-                if task_id in completed_tasks:
-                    continue
-                    
-                status = await task_manager.get_task_status(task_id)
-                if status and status['status'] in ['completed', 'failed', 'cancelled']:
-                    completed_tasks.add(task_id)
-                    print(f"Task {task_id[:8]} {status['status']}")
-                    
-                    if status['status'] == 'failed':
-                        print(f"  Error: {status.get('error', 'Unknown')}")
+        for completion in asyncio.as_completed([task_manager.wait_for(t) for t in tasks]):
+            status = await completion
+            if not status:
+                continue
+            print(f"Task {status['task_id'][:8]} {status['status']}")
             
-            await asyncio.sleep(2)
+            if status['status'] == 'failed':
+                print(f"  Error: {status.get('error', 'Unknown')}")
         
         # Show final metrics
         metrics = await task_manager.get_metrics()
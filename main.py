@@ -10,35 +10,82 @@ import time
 from contextlib import asynccontextmanager
 
 import click
-import uvicorn
-from dotenv import load_dotenv
 
-from src.dashboard.app import app
 from src.utils.task_manager_simple import task_manager
-from src.monitoring.tracing_simple import initialize_tracing
-from config.settings import settings
+from config.settings import get_settings
 
 
-# Configure logging
-logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
+def _configure_logging():
+    """Configure logging from settings (deferred so --help skips settings)"""
+    logging.basicConfig(
+        level=get_settings().log_level_num,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+
+def _loop_factory():
+    """uvloop's event loop factory when it is installed (not on Windows), else None"""
+    if sys.platform == "win32":
+        return None
+    try:
+        import uvloop
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
+_DOTENV_LOADED = False
+
+
+def _load_dotenv_once():
+    """Load the .env file into the environment at most once per process"""
+    global _DOTENV_LOADED
+    if not _DOTENV_LOADED:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+        _DOTENV_LOADED = True
+
+
 class AutoOpsApplication:
-    """Main AutoOps application class"""
+    """
+    Main AutoOps application class.
+
+    A process-wide singleton: start() and stop() are reference counted so
+    nested callers share one running instance and only the last stop()
+    tears it down.
+    """
+    
+    _instance: "AutoOpsApplication" = None
+    
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
     
     def __init__(self):
+        if self._initialized:
+            return
+        self._initialized = True
         self.is_running = False
         self.tasks = []
+        self._refcount = 0
     
     async def start(self):
         """Start the AutoOps application"""
+        self._refcount += 1
+        if self.is_running:
+            return
+        
         logger.info("Starting AutoOps application...")
         
         try:
+            from src.monitoring.tracing_simple import initialize_tracing
+
             # Initialize tracing
             initialize_tracing()
             logger.info("OpenTelemetry tracing initialized")
@@ -51,11 +98,16 @@ class AutoOpsApplication:
             logger.info("AutoOps application started successfully")
             
         except Exception as e:
+            self._refcount -= 1
             logger.error(f"Failed to start AutoOps application: {e}")
             raise
     
     async def stop(self):
         """Stop the AutoOps application"""
+        self._refcount = max(self._refcount - 1, 0)
+        if self._refcount:
+            return
+        
         logger.info("Stopping AutoOps application...")
         
         try:
@@ -94,34 +146,53 @@ autoops_app = AutoOpsApplication()
 @asynccontextmanager
 async def lifespan(app):
     """FastAPI lifespan manager"""
+    # The dashboard's own lifespan starts its WebSocket pushes; run it inside ours
+    from src.dashboard.app import lifespan as dashboard_lifespan
+    
     # Startup
     await autoops_app.start()
-    yield
-    # Shutdown
-    await autoops_app.stop()
+    try:
+        async with dashboard_lifespan(app):
+            yield
+    finally:
+        # Shutdown
+        await autoops_app.stop()
 
 
-# Update FastAPI app with lifespan
-app.router.lifespan_context = lifespan
+def __getattr__(name):
+    """Import the dashboard app on first access so CLI commands skip FastAPI"""
+    if name == "app":
+        from src.dashboard.app import app
+
+        _configure_logging()
+
+        # Update FastAPI app with lifespan
+        app.router.lifespan_context = lifespan
+        globals()["app"] = app
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @click.group()
 def cli():
     """AutoOps Multi-Agent Kubernetes Orchestrator"""
-    pass
+    _configure_logging()
 
 
 @cli.command()
-@click.option('--host', default=settings.dashboard_host, help='Host to bind the server to')
-@click.option('--port', default=settings.dashboard_port, help='Port to bind the server to')
+@click.option('--host', default=lambda: get_settings().dashboard_host, help='Host to bind the server to')
+@click.option('--port', type=int, default=lambda: get_settings().dashboard_port, help='Port to bind the server to')
 @click.option('--reload', is_flag=True, help='Enable auto-reload for development')
 @click.option('--workers', default=1, help='Number of worker processes')
 def serve(host, port, reload, workers):
     """Start the AutoOps server"""
+    import uvicorn
+
+    settings = get_settings()
     logger.info(f"Starting AutoOps server on {host}:{port}")
     
-    # Load environment variables
-    load_dotenv()
+    # No-op when the entry point already loaded it
+    _load_dotenv_once()
     
     uvicorn.run(
         "main:app",
@@ -129,7 +200,11 @@ def serve(host, port, reload, workers):
         port=port,
         reload=reload or settings.dev_mode,
         workers=workers if not reload else 1,
-        log_level=settings.log_level.lower()
+        log_level=settings.log_level.lower(),
+        # C event loop and HTTP parser from uvicorn[standard]
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets"
     )
 
 
@@ -154,22 +229,18 @@ def submit(request, priority, timeout):
             click.echo(f"Task submitted: {task_id}")
             
             # Wait for completion
-            while True:
-                status = await task_manager.get_task_status(task_id)
-                if status and status in ['completed', 'failed', 'cancelled']:
-                    click.echo(f"Task {status}: {task_id}")
-                    if status == 'failed':
-                        # Get task details for error info
-                        task = task_manager.tasks.get(task_id)
-                        if task and task.error:
-                            click.echo(f"Error: {task.error}")
-                    break
-                await asyncio.sleep(1)
+            status = await task_manager.wait_for(task_id)
+            click.echo(f"Task {status}: {task_id}")
+            if status == 'failed':
+                # Get task details for error info
+                task = task_manager.tasks.get(task_id)
+                if task and task.error:
+                    click.echo(f"Error: {task.error}")
                 
         finally:
             await autoops_app.stop()
     
-    asyncio.run(_submit())
+    run_async(_submit())
 
 
 @cli.command()
@@ -212,7 +283,7 @@ def list_tasks(limit, status):
         finally:
             await autoops_app.stop()
     
-    asyncio.run(_list(limit, status))
+    run_async(_list(limit, status))
 
 
 @cli.command()
@@ -232,7 +303,7 @@ def cancel(task_id):
         finally:
             await autoops_app.stop()
     
-    asyncio.run(_cancel())
+    run_async(_cancel())
 
 
 @cli.command()
@@ -255,14 +326,36 @@ def health():
         finally:
             await autoops_app.stop()
     
-    asyncio.run(_health())
+    run_async(_health())
+
+
+def run_async(coro):
+    """
+    Run a CLI coroutine, cancelling it on SIGINT/SIGTERM so its cleanup
+    (e.g. autoops_app.stop()) runs on the event loop thread.
+    """
+    async def _main():
+        task = asyncio.current_task()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, task.cancel)
+        try:
+            return await coro
+        except asyncio.CancelledError:
+            logger.info("Shutdown requested, exiting")
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                loop.remove_signal_handler(sig)
+    
+    # Pass uvloop per run rather than installing a global event-loop policy
+    with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+        return runner.run(_main())
 
 
 def setup_signal_handlers():
-    """Setup signal handlers for graceful shutdown"""
+    """Setup signal handlers for shutdown before an event loop is running"""
     def signal_handler(signum, frame):
         logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(autoops_app.stop())
         sys.exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
@@ -271,7 +364,7 @@ def setup_signal_handlers():
 
 if __name__ == "__main__":
     # Load environment variables
-    load_dotenv()
+    _load_dotenv_once()
     
     # Setup signal handlers
     setup_signal_handlers()
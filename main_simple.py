@@ -15,6 +15,7 @@ class SimpleSettings:
         self.dashboard_host = os.getenv("DASHBOARD_HOST", "0.0.0.0")
         self.dashboard_port = int(os.getenv("DASHBOARD_PORT", "8080"))
         self.log_level = os.getenv("LOG_LEVEL", "INFO")
+        self.log_level_num = getattr(logging, self.log_level.upper(), logging.INFO)
         self.dev_mode = os.getenv("DEV_MODE", "false").lower() == "true"
         self.openai_api_key = os.getenv("OPENAI_API_KEY", "")
 
@@ -22,7 +23,7 @@ settings = SimpleSettings()
 
 # Configure logging
 logging.basicConfig(
-    level=getattr(logging, settings.log_level.upper()),
+    level=settings.log_level_num,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -30,22 +31,12 @@ logger = logging.getLogger(__name__)
 
 def load_env_file():
     """Load environment variables from .env file"""
+    from config.settings_simple import load_env_file as _load_env_file
+
     env_file = Path(__file__).parent / "config" / ".env"
     if env_file.exists():
-        try:
-            # Try to use python-dotenv if available
-            from dotenv import load_dotenv
-            load_dotenv(str(env_file))
-            logger.info("Loaded environment from .env file")
-        except ImportError:
-            # Manual parsing if dotenv not available
-            logger.info("Loading environment manually (dotenv not available)")
-            with open(env_file) as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#') and '=' in line:
-                        key, value = line.split('=', 1)
-                        os.environ.setdefault(key.strip(), value.strip())
+        _load_env_file(env_file)
+        logger.info("Loaded environment from .env file")
 
 
 class AutoOpsApplication:
@@ -157,10 +148,11 @@ async def health():
 
 
 def setup_signal_handlers():
-    """Setup signal handlers for graceful shutdown"""
+    """Setup signal handlers for shutdown before an event loop is running"""
     def signal_handler(signum, frame):
+        # Scheduling autoops_app.stop() here is unsafe without a running loop;
+        # SystemExit unwinds any asyncio.run() and its cleanup instead.
         logger.info(f"Received signal {signum}, shutting down...")
-        asyncio.create_task(autoops_app.stop())
         sys.exit(0)
     
     signal.signal(signal.SIGINT, signal_handler)
@@ -3,42 +3,172 @@ Executor Agent - Executes Kubernetes operations based on execution plans
 """
 
 import asyncio
+import time
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Set
 from uuid import uuid4
 
+from kubernetes.client.rest import ApiException
 from opentelemetry import trace
-from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+from urllib3.exceptions import HTTPError as TransportError
 
 from ..kubernetes.client_simple import KubernetesClient
 from ..monitoring.tracing_simple import get_tracer
 from .state import (
     AutoOpsState,
     ExecutionResult,
+    KubernetesAction,
     KubernetesOperation,
     TaskStatus,
     AgentType
 )
-from config.settings import settings
+from config.settings import get_settings
 
 tracer = get_tracer(__name__)
 
+_RETRY_MAX_WAIT = 30.0
+_jittered_backoff = wait_exponential_jitter(initial=1.0, max=_RETRY_MAX_WAIT, jitter=0.5)
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry rate limiting, server errors and transport failures; never other 4xx"""
+    if isinstance(exc, ApiException):
+        return exc.status == 429 or (exc.status or 0) >= 500
+    return isinstance(exc, (OSError, TransportError))
+
+
+def _retry_wait(retry_state) -> float:
+    """Honor the API server's Retry-After header, otherwise use jittered backoff"""
+    exc = retry_state.outcome.exception()
+    headers = getattr(exc, "headers", None)
+    if isinstance(exc, ApiException) and headers:
+        try:
+            return min(float(headers.get("Retry-After")), _RETRY_MAX_WAIT)
+        except (TypeError, ValueError):
+            pass
+    return _jittered_backoff(retry_state)
+
+
+def _read_version(operation: KubernetesOperation) -> Optional[str]:
+    """resourceVersion for a read: "0" lets the apiserver answer from its watch cache"""
+    return "0" if operation.consistency == "cache" else None
+
+
+class AdmissionController:
+    """
+    Concurrency limiter whose limit can be resized while operations are in
+    flight (unlike asyncio.Semaphore, whose capacity is fixed).
+    """
+    
+    def __init__(self, limit: int):
+        self._active = 0
+        self._limit = max(1, limit)
+        self._cond = asyncio.Condition()
+    
+    @property
+    def limit(self) -> int:
+        return self._limit
+    
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self._active < self._limit)
+            self._active += 1
+    
+    async def release(self):
+        async with self._cond:
+            self._active -= 1
+            self._cond.notify(1)
+    
+    async def set_limit(self, limit: int):
+        """Change the concurrency limit; waiters are admitted if it grew"""
+        async with self._cond:
+            self._limit = max(1, limit)
+            self._cond.notify_all()
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+
 
 class ExecutorAgent:
     """
     Executor Agent that executes Kubernetes operations from execution plans
     """
     
+    # Action -> coroutine factory taking (k8s_client, operation, resource_type string)
+    _DISPATCH = {
+        KubernetesAction.CREATE: lambda c, o, rt: c.create_resource(
+            resource_type=rt,
+            namespace=o.namespace,
+            manifest=o.manifest
+        ),
+        KubernetesAction.UPDATE: lambda c, o, rt: c.update_resource(
+            resource_type=rt,
+            name=o.resource_name,
+            namespace=o.namespace,
+            manifest=o.manifest
+        ),
+        KubernetesAction.DELETE: lambda c, o, rt: c.delete_resource(
+            resource_type=rt,
+            name=o.resource_name,
+            namespace=o.namespace
+        ),
+        KubernetesAction.SCALE: lambda c, o, rt: c.scale_deployment(
+            name=o.resource_name,
+            namespace=o.namespace,
+            replicas=o.parameters.get("replicas", 1)
+        ),
+        KubernetesAction.GET: lambda c, o, rt: c.get_resource(
+            resource_type=rt,
+            name=o.resource_name,
+            namespace=o.namespace,
+            resource_version=_read_version(o)
+        ),
+        KubernetesAction.LIST: lambda c, o, rt: c.list_resources(
+            resource_type=rt,
+            namespace=o.namespace,
+            resource_version=_read_version(o)
+        ),
+        KubernetesAction.PATCH: lambda c, o, rt: c.patch_resource(
+            resource_type=rt,
+            name=o.resource_name,
+            namespace=o.namespace,
+            patch=o.manifest
+        ),
+    }
+    
     def __init__(self):
-        self.k8s_client = KubernetesClient()
+        settings = get_settings()
         self.max_concurrent_operations = settings.max_concurrent_tasks
+        self.k8s_client = KubernetesClient.get_shared(
+            pool_maxsize=self.max_concurrent_operations,
+            qps=settings.kubernetes_api_qps,
+            burst=settings.kubernetes_api_burst
+        )
+        self.admission = AdmissionController(self.max_concurrent_operations)
+        # Callbacks that top up the worker pools of plans currently executing
+        self._pool_growers: Set[Callable[[], None]] = set()
+    
+    async def set_max_concurrency(self, limit: int):
+        """Resize operation concurrency at runtime (e.g. to back off a busy API server)"""
+        self.max_concurrent_operations = limit
+        await self.admission.set_limit(limit)
+        # A raised limit needs more workers in running plans to take effect
+        for grow in list(self._pool_growers):
+            grow()
     
     async def execute(self, state: AutoOpsState) -> AutoOpsState:
         """
         Execute the operations in the execution plan
         """
         with tracer.start_as_current_span("executor_agent_execute") as span:
-            span.set_attribute("request_id", str(state.request_id))
+            recording = span.is_recording()
+            if recording:
+                span.set_attribute("request_id", str(state.request_id))
             
             if not state.execution_plan:
                 state.executor_state.status = TaskStatus.FAILED
@@ -53,10 +183,11 @@ class ExecutorAgent:
                 state.current_step = "executing"
                 
                 plan = state.execution_plan
-                span.set_attribute("operations_count", len(plan.operations))
+                if recording:
+                    span.set_attribute("operations_count", len(plan.operations))
                 
                 # Execute operations
-                results = await self._execute_operations(plan.operations)
+                results = await self._execute_operations(plan.operations, fail_fast=plan.fail_fast)
                 state.execution_results.extend(results)
                 
                 # Check if all operations succeeded
@@ -74,8 +205,9 @@ class ExecutorAgent:
                 state.executor_state.last_updated = datetime.utcnow()
                 state.update_timestamp()
                 
-                span.set_attribute("successful_operations", len(results) - len(failed_operations))
-                span.set_attribute("failed_operations", len(failed_operations))
+                if recording:
+                    span.set_attribute("successful_operations", len(results) - len(failed_operations))
+                    span.set_attribute("failed_operations", len(failed_operations))
                 
                 return state
                 
@@ -89,123 +221,168 @@ class ExecutorAgent:
                 
                 return state
     
-    async def _execute_operations(self, operations: List[KubernetesOperation]) -> List[ExecutionResult]:
-        """Execute operations with concurrency control"""
-        semaphore = asyncio.Semaphore(self.max_concurrent_operations)
+    async def _execute_operations(
+        self,
+        operations: List[KubernetesOperation],
+        fail_fast: bool = False
+    ) -> List[ExecutionResult]:
+        """
+        Execute operations with concurrency control
         
-        async def execute_with_semaphore(operation: KubernetesOperation):
-            async with semaphore:
-                return await self._execute_single_operation(operation)
+        A pool of workers drains a queue of operations, so memory stays
+        constant however large the plan is. The pool starts at the admission
+        limit and grows if the limit is raised mid-plan; the admission
+        controller bounds how many operations actually run. Results keep the
+        plan's order. With fail_fast, the first failed operation stops any
+        further operation from being admitted; those are reported as CANCELLED
+        instead of being sent to the API server, while operations already in
+        flight run to completion and report their real result (their API call
+        cannot be taken back).
+        """
+        admission = self.admission
+        shared_lists = self._coalesced_list_types(operations)
+        results: List[Optional[ExecutionResult]] = [None] * len(operations)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(operations):
+            queue.put_nowait(item)
+        failed = False
+        workers = 0
         
-        # Execute operations concurrently
-        tasks = [execute_with_semaphore(op) for op in operations]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def worker():
+            nonlocal failed, workers
+            try:
+                while not failed and not queue.empty():
+                    index, operation = queue.get_nowait()
+                    async with admission:
+                        if failed:
+                            return
+                        try:
+                            result = await self._execute_single_operation(operation, shared_lists)
+                        except Exception as e:
+                            # Retries are exhausted (or the error is unrecoverable)
+                            result = ExecutionResult(
+                                operation=operation,
+                                status=TaskStatus.FAILED,
+                                error=str(e)
+                            )
+                    results[index] = result
+                    if fail_fast and result.status == TaskStatus.FAILED:
+                        failed = True
+            finally:
+                workers -= 1
         
-        # Handle exceptions
-        execution_results = []
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                execution_results.append(
-                    ExecutionResult(
-                        operation=operations[i],
-                        status=TaskStatus.FAILED,
-                        error=str(result)
-                    )
-                )
-            else:
-                execution_results.append(result)
+        def add_workers():
+            nonlocal workers
+            for _ in range(min(admission.limit - workers, queue.qsize())):
+                workers += 1
+                group.create_task(worker())
         
-        return execution_results
+        try:
+            async with asyncio.TaskGroup() as group:
+                add_workers()
+                self._pool_growers.add(add_workers)
+        finally:
+            self._pool_growers.discard(add_workers)
+        
+        return [
+            result or ExecutionResult(
+                operation=operation,
+                status=TaskStatus.CANCELLED,
+                error="Cancelled after an earlier operation failed"
+            )
+            for result, operation in zip(results, operations)
+        ]
+    
+    @staticmethod
+    def _coalesced_list_types(operations: List[KubernetesOperation]) -> Dict[tuple, Optional[asyncio.Future]]:
+        """(resource type, consistency) pairs LISTed in more than one namespace, to be fetched once cluster-wide"""
+        namespaces_by_type: Dict[tuple, set] = {}
+        for op in operations:
+            if op.action == KubernetesAction.LIST:
+                namespaces_by_type.setdefault((op.resource_type, op.consistency), set()).add(op.namespace)
+        return {key: None for key, namespaces in namespaces_by_type.items() if len(namespaces) > 1}
+    
+    async def _list_from_shared(
+        self,
+        operation: KubernetesOperation,
+        shared_lists: Dict[tuple, Optional[asyncio.Future]]
+    ) -> List[Dict[str, Any]]:
+        """Serve a LIST from one all-namespaces call shared by the whole plan"""
+        key = (operation.resource_type, operation.consistency)
+        fetch = shared_lists[key]
+        # Start the fetch on first use, or again if a previous attempt failed
+        if fetch is None or (fetch.done() and not fetch.cancelled() and fetch.exception() is not None):
+            fetch = shared_lists[key] = asyncio.ensure_future(
+                self.k8s_client.list_resources(
+                    resource_type=operation.resource_type.value,
+                    all_namespaces=True,
+                    resource_version=_read_version(operation)
+                )
+            )
+        items = await fetch
+        return [item for item in items if item.get("namespace") == operation.namespace]
     
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10)
+        wait=_retry_wait,
+        retry=retry_if_exception(_is_retryable),
+        reraise=True
     )
-    async def _execute_single_operation(self, operation: KubernetesOperation) -> ExecutionResult:
+    async def _execute_single_operation(
+        self,
+        operation: KubernetesOperation,
+        shared_lists: Optional[Dict[tuple, Optional[asyncio.Future]]] = None
+    ) -> ExecutionResult:
         """Execute a single Kubernetes operation with retry logic"""
         result = ExecutionResult(operation=operation, status=TaskStatus.EXECUTING)
+        action = operation.action
+        action_s = action.value
+        rtype_s = operation.resource_type.value
         
         with tracer.start_as_current_span("execute_k8s_operation") as span:
-            span.set_attribute("operation.action", operation.action.value)
-            span.set_attribute("operation.resource_type", operation.resource_type.value)
-            span.set_attribute("operation.namespace", operation.namespace)
-            if operation.resource_name:
-                span.set_attribute("operation.resource_name", operation.resource_name)
+            recording = span.is_recording()
+            if recording:
+                span.set_attribute("operation.action", action_s)
+                span.set_attribute("operation.resource_type", rtype_s)
+                span.set_attribute("operation.namespace", operation.namespace)
+                if operation.resource_name:
+                    span.set_attribute("operation.resource_name", operation.resource_name)
             
+            start_ns = time.perf_counter_ns()
             try:
-                start_time = datetime.utcnow()
-                
-                # Execute based on operation type
-                if operation.action.value == "CREATE":
-                    response = await self.k8s_client.create_resource(
-                        resource_type=operation.resource_type.value,
-                        namespace=operation.namespace,
-                        manifest=operation.manifest
-                    )
-                elif operation.action.value == "UPDATE":
-                    response = await self.k8s_client.update_resource(
-                        resource_type=operation.resource_type.value,
-                        name=operation.resource_name,
-                        namespace=operation.namespace,
-                        manifest=operation.manifest
-                    )
-                elif operation.action.value == "DELETE":
-                    response = await self.k8s_client.delete_resource(
-                        resource_type=operation.resource_type.value,
-                        name=operation.resource_name,
-                        namespace=operation.namespace
-                    )
-                elif operation.action.value == "SCALE":
-                    replicas = operation.parameters.get("replicas", 1)
-                    response = await self.k8s_client.scale_deployment(
-                        name=operation.resource_name,
-                        namespace=operation.namespace,
-                        replicas=replicas
-                    )
-                elif operation.action.value == "GET":
-                    response = await self.k8s_client.get_resource(
-                        resource_type=operation.resource_type.value,
-                        name=operation.resource_name,
-                        namespace=operation.namespace
-                    )
-                elif operation.action.value == "LIST":
-                    response = await self.k8s_client.list_resources(
-                        resource_type=operation.resource_type.value,
-                        namespace=operation.namespace
-                    )
-                elif operation.action.value == "PATCH":
-                    response = await self.k8s_client.patch_resource(
-                        resource_type=operation.resource_type.value,
-                        name=operation.resource_name,
-                        namespace=operation.namespace,
-                        patch=operation.manifest
-                    )
+                if (shared_lists and action == KubernetesAction.LIST
+                        and (operation.resource_type, operation.consistency) in shared_lists):
+                    response = await self._list_from_shared(operation, shared_lists)
                 else:
-                    raise ValueError(f"Unsupported operation: {operation.action}")
+                    # Execute based on operation type
+                    handler = self._DISPATCH.get(action)
+                    if handler is None:
+                        raise ValueError(f"Unsupported operation: {action_s}")
+                    response = await handler(self.k8s_client, operation, rtype_s)
                 
-                end_time = datetime.utcnow()
-                duration = (end_time - start_time).total_seconds()
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 result.status = TaskStatus.COMPLETED
                 result.result = response
-                result.completed_at = end_time
+                result.completed_at = datetime.utcnow()
                 result.duration = duration
                 
-                span.set_attribute("operation.success", True)
-                span.set_attribute("operation.duration", duration)
+                if recording:
+                    span.set_attribute("operation.success", True)
+                    span.set_attribute("operation.duration", duration)
                 
             except Exception as e:
-                end_time = datetime.utcnow()
-                duration = (end_time - start_time).total_seconds()
+                duration = (time.perf_counter_ns() - start_ns) / 1e9
                 
                 result.status = TaskStatus.FAILED
                 result.error = str(e)
-                result.completed_at = end_time
+                result.completed_at = datetime.utcnow()
                 result.duration = duration
                 
                 span.record_exception(e)
-                span.set_attribute("operation.success", False)
-                span.set_attribute("operation.error", str(e))
+                if recording:
+                    span.set_attribute("operation.success", False)
+                    span.set_attribute("operation.error", str(e))
                 
                 raise  # Re-raise for retry logic
         
@@ -217,10 +394,10 @@ class ExecutorAgent:
         
         # Reverse the order for rollback
         for result in reversed(results):
-            if result.status == TaskStatus.COMPLETED and result.operation.action.value == "CREATE":
+            if result.status == TaskStatus.COMPLETED and result.operation.action == KubernetesAction.CREATE:
                 # Create rollback operation (DELETE)
                 rollback_op = KubernetesOperation(
-                    action="DELETE",
+                    action=KubernetesAction.DELETE,
                     resource_type=result.operation.resource_type,
                     resource_name=result.operation.resource_name,
                     namespace=result.operation.namespace
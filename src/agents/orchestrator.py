@@ -3,21 +3,31 @@ AutoOps Orchestrator - LangGraph workflow for multi-agent Kubernetes operations
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union
 from uuid import uuid4
 
 from langgraph.graph import StateGraph, END
 from langgraph.checkpoint.memory import MemorySaver
 from opentelemetry import trace
 
-from .state import AutoOpsState, TaskStatus
+from .state import AgentState, AutoOpsState, KubernetesAction, TaskStatus
 from .planner import PlannerAgent
 from .executor import ExecutorAgent
 from ..monitoring.tracing_simple import get_tracer, initialize_tracing
-from config.settings import settings
+from config.settings import get_settings
 
 tracer = get_tracer(__name__)
 
+# Plans made only of these actions cannot change the cluster
+_READ_ONLY_ACTIONS = frozenset({KubernetesAction.GET, KubernetesAction.LIST})
+
+
+def _with_status(agent_state: Union[AgentState, Dict[str, Any]], status: TaskStatus):
+    """Shallow copy of an agent state with a new status"""
+    if isinstance(agent_state, AgentState):
+        return agent_state.model_copy(update={"status": status})
+    return {**agent_state, "status": status}
+
 
 class AutoOpsOrchestrator:
     """
@@ -59,6 +69,7 @@ class AutoOpsOrchestrator:
             self._should_execute,
             {
                 "execute": "validator",
+                "execute_readonly": "executor",
                 "error": "error_handler",
                 "end": END
             }
@@ -93,7 +104,9 @@ class AutoOpsOrchestrator:
         Process a natural language request through the multi-agent workflow
         """
         with tracer.start_as_current_span("orchestrator_process_request") as span:
-            span.set_attribute("request", request)
+            recording = span.is_recording()
+            if recording:
+                span.set_attribute("request", request)
             
             # Create initial state
             initial_state = AutoOpsState(
@@ -101,7 +114,8 @@ class AutoOpsOrchestrator:
                 original_request=request
             )
             
-            span.set_attribute("request_id", str(initial_state.request_id))
+            if recording:
+                span.set_attribute("request_id", str(initial_state.request_id))
             
             try:
                 # Execute the workflow
@@ -109,8 +123,9 @@ class AutoOpsOrchestrator:
                 
                 result = await self.app.ainvoke(initial_state, config=config)
                 
-                span.set_attribute("workflow_completed", True)
-                span.set_attribute("final_status", result.current_step)
+                if recording:
+                    span.set_attribute("workflow_completed", True)
+                    span.set_attribute("final_status", result.current_step)
                 
                 return result
                 
@@ -145,6 +160,8 @@ class AutoOpsOrchestrator:
                 issues = await self.planner.validate_plan(state.execution_plan)
                 
                 if issues:
+                    # Don't serve the rejected plan from cache on retry
+                    self.planner.invalidate_plan(state.original_request)
                     state.add_error(f"Plan validation issues: {'; '.join(issues)}")
                     span.set_attribute("validation_passed", False)
                     span.set_attribute("issues_count", len(issues))
@@ -162,15 +179,17 @@ class AutoOpsOrchestrator:
     async def _error_handler_node(self, state: AutoOpsState) -> AutoOpsState:
         """Handle errors and potentially retry"""
         with tracer.start_as_current_span("error_handler_node") as span:
-            span.set_attribute("error_count", len(state.errors))
-            span.set_attribute("retry_count", state.retry_count)
-            
-            # Log errors
-            for error in state.errors:
-                span.add_event("error", {"error": error})
+            recording = span.is_recording()
+            if recording:
+                span.set_attribute("error_count", len(state.errors))
+                span.set_attribute("retry_count", state.retry_count)
+                
+                # Log errors
+                for error in state.errors:
+                    span.add_event("error", {"error": error})
             
             # Check if we should retry
-            if state.retry_count < settings.retry_max_attempts:
+            if state.retry_count < get_settings().retry_max_attempts:
                 state.retry_count += 1
                 state.current_step = "retrying"
                 
@@ -178,10 +197,12 @@ class AutoOpsOrchestrator:
                 state.planner_state.status = TaskStatus.PENDING
                 state.executor_state.status = TaskStatus.PENDING
                 
-                span.set_attribute("action", "retry")
+                if recording:
+                    span.set_attribute("action", "retry")
             else:
                 state.current_step = "failed"
-                span.set_attribute("action", "failed")
+                if recording:
+                    span.set_attribute("action", "failed")
             
             return state
     
@@ -190,6 +211,9 @@ class AutoOpsOrchestrator:
         if state.planner_state.status == TaskStatus.FAILED:
             return "error"
         elif state.planner_state.status == TaskStatus.COMPLETED and state.execution_plan:
+            # Read-only queries have nothing to validate; go straight to the executor
+            if all(op.action in _READ_ONLY_ACTIONS for op in state.execution_plan.operations):
+                return "execute_readonly"
             return "execute"
         else:
             return "end"
@@ -206,7 +230,7 @@ class AutoOpsOrchestrator:
     def _check_execution_result(self, state: AutoOpsState) -> str:
         """Check execution results and determine next action"""
         if state.executor_state.status == TaskStatus.FAILED:
-            if state.retry_count < settings.retry_max_attempts:
+            if state.retry_count < get_settings().retry_max_attempts:
                 return "retry"
             else:
                 return "error"
@@ -215,21 +239,34 @@ class AutoOpsOrchestrator:
         else:
             return "error"
     
-    async def get_workflow_status(self, request_id: str) -> Dict[str, Any]:
-        """Get the current status of a workflow"""
+    async def get_workflow_status(self, request_id: str, full: bool = False) -> Dict[str, Any]:
+        """
+        Get the current status of a workflow
+        
+        By default the plan and results are summarized; pass full=True to
+        include every operation manifest and API response.
+        """
         try:
             config = {"configurable": {"thread_id": request_id}}
             state = await self.app.aget_state(config)
             
             if state and state.values:
-                autoops_state = AutoOpsState.parse_obj(state.values)
+                # Validate so agent states written as dicts (e.g. by cancel_workflow) are coerced
+                autoops_state = AutoOpsState.model_validate(state.values)
+                plan = autoops_state.execution_plan
+                if full:
+                    plan_data = plan.dict() if plan else None
+                    results_data = [r.dict() for r in autoops_state.execution_results]
+                else:
+                    plan_data = plan.summary() if plan else None
+                    results_data = [r.summary() for r in autoops_state.execution_results]
                 return {
                     "request_id": str(autoops_state.request_id),
                     "current_step": autoops_state.current_step,
                     "planner_status": autoops_state.planner_state.status.value,
                     "executor_status": autoops_state.executor_state.status.value,
-                    "execution_plan": autoops_state.execution_plan.dict() if autoops_state.execution_plan else None,
-                    "execution_results": [r.dict() for r in autoops_state.execution_results],
+                    "execution_plan": plan_data,
+                    "execution_results": results_data,
                     "errors": autoops_state.errors,
                     "retry_count": autoops_state.retry_count,
                     "created_at": autoops_state.created_at.isoformat(),
@@ -250,13 +287,14 @@ class AutoOpsOrchestrator:
             state = await self.app.aget_state(config)
             
             if state and state.values:
-                autoops_state = AutoOpsState.parse_obj(state.values)
-                autoops_state.planner_state.status = TaskStatus.CANCELLED
-                autoops_state.executor_state.status = TaskStatus.CANCELLED
-                autoops_state.current_step = "cancelled"
+                values = state.values
                 
-                # Update state
-                await self.app.aupdate_state(config, autoops_state.dict())
+                # Update only the changed fields; plan and results are shared as-is
+                await self.app.aupdate_state(config, {
+                    "planner_state": _with_status(values["planner_state"], TaskStatus.CANCELLED),
+                    "executor_state": _with_status(values["executor_state"], TaskStatus.CANCELLED),
+                    "current_step": "cancelled"
+                })
                 return True
             
             return False
@@ -2,16 +2,27 @@
 Planner Agent - Interprets natural language requests and creates execution plans
 """
 
+import asyncio
+import atexit
+import copy
+import hashlib
 import json
+import logging
+import re
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Annotated, Any, AsyncIterator, Dict, List, Optional
 from uuid import uuid4
 
+import httpx
 from langchain_openai import ChatOpenAI
 from langchain.schema import BaseMessage, HumanMessage, SystemMessage
 from opentelemetry import trace
+from pydantic import BaseModel, BeforeValidator, ConfigDict, ValidationError
+from pydantic_core import from_json
 
 from ..monitoring.tracing_simple import get_tracer
+from ..utils.cache import TTLCache
 from .state import (
     AutoOpsState, 
     ExecutionPlan, 
@@ -22,28 +33,40 @@ from .state import (
     AgentType,
     ActionStep
 )
-from config.settings import settings
+from config.settings import get_settings
 
 tracer = get_tracer(__name__)
 
+# Connection pool shared by every planner's LLM calls; idle connections are
+# kept for 10 minutes so bursts of plans skip the TCP/TLS handshake
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200, keepalive_expiry=600)
+_HTTP_TIMEOUT = httpx.Timeout(60.0)
 
-class PlannerAgent:
+
+@lru_cache(maxsize=None)
+def get_shared_llm(model: str, api_key: str, base_url: Optional[str] = None) -> ChatOpenAI:
     """
-    Planner Agent that interprets natural language requests and creates
-    detailed execution plans for Kubernetes operations.
+    Get a process-wide ChatOpenAI client for the given model.
+
+    The client reuses pooled keep-alive HTTP connections so repeated plans
+    don't pay a new TCP/TLS handshake per request. base_url points it at an
+    OpenAI-compatible server instead, such as vLLM serving the model with a
+    speculative draft model.
     """
-    
-    def __init__(self):
-        self.llm = ChatOpenAI(
-            model=settings.openai_model,
-            api_key=settings.openai_api_key,
-            temperature=0.1
-        )
-        self.system_prompt = self._get_system_prompt()
-    
-    def _get_system_prompt(self) -> str:
-        """Get the system prompt for the planner agent"""
-        return """
+    http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=True)
+    atexit.register(http_client.close)
+    return ChatOpenAI(
+        model=model,
+        api_key=api_key,
+        base_url=base_url,
+        temperature=0.1,
+        http_client=http_client,
+        # HTTP/2 multiplexes concurrent (batched) planner calls over one connection
+        http_async_client=httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=True)
+    )
+
+
+SYSTEM_PROMPT = """
 You are an expert Kubernetes operations planner. Your role is to interpret natural language requests 
 and create detailed, executable plans for Kubernetes operations.
 
@@ -91,48 +114,217 @@ Examples:
 
 Be precise and ensure all operations are valid Kubernetes actions.
 """
+
+# Built once and shared by every planner; only the HumanMessage varies per request.
+# Keeping the system message byte-identical (and first) lets OpenAI's automatic
+# prompt caching reuse the prefix across calls.
+_SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+_SYSTEM_PROMPT_HASH = hashlib.sha256(SYSTEM_PROMPT.encode()).hexdigest()
+
+# Step ids for typical plan sizes, built once
+_STEP_IDS = tuple(f"step_{i}" for i in range(1, 1025))
+
+# Markdown code fence (with optional json tag, any case) around an LLM response
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*|\s*```\s*$", re.IGNORECASE)
+
+# Parsed plans shared by every planner in the process, and LLM calls in progress
+_PLAN_CACHE = TTLCache(maxsize=2048, ttl=600)
+_IN_FLIGHT: Dict[tuple, asyncio.Future] = {}
+
+
+def _normalize_request(user_request: str) -> str:
+    """Collapse whitespace so equivalent requests share a cache entry (case is kept: names are case-sensitive)"""
+    return " ".join(user_request.split())
+
+
+class _PromptBatcher:
+    """
+    Coalesces prompts submitted within a short window into one llm.abatch()
+    call. The worker runs only while there are prompts queued.
+    """
     
-    def plan(self, user_request: str, context: Optional[Dict[str, Any]] = None) -> List[ActionStep]:
+    def __init__(self, llm: ChatOpenAI, max_batch: int = 8, max_wait: float = 0.005):
+        self.llm = llm
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._worker: Optional[asyncio.Task] = None
+    
+    async def submit(self, messages: List[BaseMessage]) -> Any:
+        """Queue a prompt and wait for its LLM response"""
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((messages, future))
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return await future
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while not self._queue.empty():
+            batch = [self._queue.get_nowait()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            batch = [(messages, future) for messages, future in batch if not future.done()]
+            if not batch:
+                continue
+            try:
+                responses = await self.llm.abatch(
+                    [messages for messages, _ in batch], return_exceptions=True
+                )
+            except Exception as e:
+                responses = [e] * len(batch)
+            
+            for (_, future), response in zip(batch, responses):
+                if future.done():
+                    continue
+                if isinstance(response, BaseException):
+                    future.set_exception(response)
+                else:
+                    future.set_result(response)
+
+
+@lru_cache(maxsize=64)
+def _to_action(value: str) -> KubernetesAction:
+    """Convert an LLM action string (any case) to a KubernetesAction"""
+    return KubernetesAction(value.lower())
+
+
+@lru_cache(maxsize=64)
+def _to_resource_type(value: str) -> ResourceType:
+    """Convert an LLM resource type string (any case) to a ResourceType"""
+    return ResourceType(value.lower())
+
+
+class OperationModel(BaseModel):
+    """One operation as returned by the LLM; enum strings are matched in any case"""
+    model_config = ConfigDict(extra="ignore")
+    
+    action: Annotated[KubernetesAction, BeforeValidator(lambda v: _to_action(v) if isinstance(v, str) else v)]
+    resource_type: Annotated[ResourceType, BeforeValidator(lambda v: _to_resource_type(v) if isinstance(v, str) else v)]
+    resource_name: Optional[str] = None
+    namespace: str = "default"
+    manifest: Optional[Dict[str, Any]] = None
+    parameters: Optional[Dict[str, Any]] = None
+
+
+class PlanModel(BaseModel):
+    """Plan as returned by the LLM, parsed and validated in one pass"""
+    model_config = ConfigDict(extra="ignore")
+    
+    description: str
+    operations: List[OperationModel]
+    estimated_duration: Optional[int] = 60
+
+
+class PlannerAgent:
+    """
+    Planner Agent that interprets natural language requests and creates
+    detailed execution plans for Kubernetes operations.
+    """
+    
+    def __init__(self):
+        settings = get_settings()
+        self.llm = get_shared_llm(settings.openai_model, settings.openai_api_key, settings.openai_base_url)
+        self.system_prompt = self._get_system_prompt()
+        self._system_msg = _SYSTEM_MESSAGE
+        self._model = settings.openai_model
+        self._plan_cache = _PLAN_CACHE
+        self._batcher = _PromptBatcher(self.llm)
+        self._prompt_tokens = 0
+        self._cached_prompt_tokens = 0
+        self.logger = logging.getLogger(__name__)
+    
+    def _get_system_prompt(self) -> str:
+        """Get the system prompt for the planner agent"""
+        return SYSTEM_PROMPT
+    
+    def plan(
+        self,
+        user_request: str,
+        context: Optional[Dict[str, Any]] = None,
+        cache_bypass: bool = False
+    ) -> List[ActionStep]:
         """
         Plan the execution steps for a given user request.
         
         Args:
             user_request: Natural language request from user
             context: Optional context information
+            cache_bypass: Always ask the LLM, ignoring (but refreshing) the plan cache
             
         Returns:
             List of action steps to execute
         """
         with tracer.start_as_current_span("planner_agent_plan") as span:
-            span.set_attribute("user_request", user_request)
+            if span.is_recording():
+                span.set_attribute("user_request", user_request)
             
             try:
-                # Build prompt with context
-                prompt = self._build_prompt(user_request, context)
+                # Repeated requests reuse the parsed plan instead of calling the LLM
+                cache_key = self._plan_cache_key(user_request, context)
+                plan_data = self._cached_plan(cache_key, cache_bypass, span)
                 
-                # Get LLM response
-                response = self.llm.invoke(prompt)
-                response_text = response.content if hasattr(response, 'content') else str(response)
+                if plan_data is None:
+                    # Build prompt with context
+                    prompt = self._build_prompt(user_request, context)
+                    
+                    # Get LLM response
+                    response = self.llm.invoke(prompt)
+                    plan_data = self._accept_response(response, cache_key)
                 
-                # Parse and validate response
-                plan_data = self._parse_llm_response(response_text)
-                execution_plan = self._create_execution_plan(plan_data)
+                steps = self._to_steps(self._create_execution_plan(plan_data))
+                span.set_status("OK")
+                return steps
+                
+            except Exception as e:
+                span.set_status("ERROR", str(e))
+                self.logger.error(f"Planning failed: {str(e)}")
+                raise
+    
+    async def aplan(
+        self,
+        user_request: str,
+        context: Optional[Dict[str, Any]] = None,
+        cache_bypass: bool = False
+    ) -> List[ActionStep]:
+        """
+        Async variant of plan().
+        
+        Concurrent calls for equivalent requests share a single in-flight
+        LLM call instead of each paying for their own, and distinct requests
+        arriving together are sent to the LLM as one batch.
+        """
+        with tracer.start_as_current_span("planner_agent_aplan") as span:
+            if span.is_recording():
+                span.set_attribute("user_request", user_request)
+            
+            try:
+                cache_key = self._plan_cache_key(user_request, context)
+                plan_data = self._cached_plan(cache_key, cache_bypass, span)
                 
-                # Convert to ActionSteps
-                steps = []
-                for i, operation in enumerate(execution_plan.operations):
-                    step = ActionStep(
-                        step_id=f"step_{i+1}",
-                        action=operation.action.value,
-                        resource_type=operation.resource_type.value,
-                        resource_name=operation.resource_name,
-                        namespace=operation.namespace,
-                        manifest=operation.manifest,
-                        parameters=operation.parameters,
-                        dependencies=[]  # TODO: Extract dependencies
-                    )
-                    steps.append(step)
+                if plan_data is None:
+                    if cache_key is None or cache_bypass:
+                        plan_data = await self._request_plan_data(user_request, context, None)
+                    else:
+                        pending = _IN_FLIGHT.get(cache_key)
+                        if pending is None:
+                            pending = asyncio.ensure_future(
+                                self._request_plan_data(user_request, context, cache_key)
+                            )
+                            _IN_FLIGHT[cache_key] = pending
+                            pending.add_done_callback(lambda _: _IN_FLIGHT.pop(cache_key, None))
+                        # Shielded so one cancelled caller doesn't cancel the shared call
+                        plan_data = await asyncio.shield(pending)
                 
+                steps = self._to_steps(self._create_execution_plan(plan_data))
                 span.set_status("OK")
                 return steps
                 
@@ -141,88 +333,226 @@ Be precise and ensure all operations are valid Kubernetes actions.
                 self.logger.error(f"Planning failed: {str(e)}")
                 raise
     
-    def _build_prompt(self, user_request: str, context: Optional[Dict[str, Any]] = None) -> str:
-        """Build prompt for LLM"""
+    async def astream_plan(
+        self,
+        user_request: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[ActionStep]:
+        """
+        Stream the plan's steps while the LLM is still generating it.
+        
+        Each operation is yielded as soon as the next one starts in the
+        output, so callers can begin scheduling before decoding finishes.
+        The complete response is validated and cached at the end.
+        """
+        with tracer.start_as_current_span("planner_agent_astream_plan") as span:
+            if span.is_recording():
+                span.set_attribute("user_request", user_request)
+            
+            cache_key = self._plan_cache_key(user_request, context)
+            plan_data = self._cached_plan(cache_key, False, span)
+            if plan_data is not None:
+                for step in self._to_steps(self._create_execution_plan(plan_data)):
+                    yield step
+                return
+            
+            try:
+                chunks: List[str] = []
+                emitted = 0
+                async for chunk in self.llm.astream(self._build_prompt(user_request, context)):
+                    text = chunk.content if hasattr(chunk, 'content') else str(chunk)
+                    chunks.append(text)
+                    # A closing brace may complete an operation; re-parse only then
+                    if "}" not in text:
+                        continue
+                    try:
+                        partial = from_json(_FENCE_RE.sub("", "".join(chunks)), allow_partial=True)
+                    except ValueError:
+                        continue
+                    operations = partial.get("operations") if isinstance(partial, dict) else None
+                    # The last operation may still be incomplete
+                    while operations and emitted < len(operations) - 1:
+                        yield self._to_step(emitted, OperationModel.model_validate(operations[emitted]))
+                        emitted += 1
+                
+                plan_data = self._parse_llm_response("".join(chunks))
+                if cache_key:
+                    self._plan_cache.set(cache_key, plan_data)
+                for i in range(emitted, len(plan_data.operations)):
+                    yield self._to_step(i, plan_data.operations[i])
+                
+                span.set_status("OK")
+                
+            except Exception as e:
+                span.set_status("ERROR", str(e))
+                self.logger.error(f"Planning failed: {str(e)}")
+                raise
+    
+    async def _request_plan_data(
+        self,
+        user_request: str,
+        context: Optional[Dict[str, Any]],
+        cache_key: Optional[tuple]
+    ) -> PlanModel:
+        """Ask the LLM for a plan and return it parsed"""
+        response = await self._batcher.submit(self._build_prompt(user_request, context))
+        return self._accept_response(response, cache_key)
+    
+    def _accept_response(self, response: Any, cache_key: Optional[tuple]) -> PlanModel:
+        """Parse and validate an LLM response, and cache it"""
+        self._record_prompt_cache_usage(response)
+        response_text = response.content if hasattr(response, 'content') else str(response)
+        plan_data = self._parse_llm_response(response_text)
+        if cache_key:
+            self._plan_cache.set(cache_key, plan_data)
+        return plan_data
+    
+    def _record_prompt_cache_usage(self, response: Any):
+        """Track how many prompt tokens OpenAI served from its prefix cache"""
+        usage = (getattr(response, "response_metadata", None) or {}).get("token_usage") or {}
+        prompt_tokens = usage.get("prompt_tokens")
+        if not prompt_tokens:
+            return
+        cached_tokens = (usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+        
+        self._prompt_tokens += prompt_tokens
+        self._cached_prompt_tokens += cached_tokens
+        self.logger.debug(
+            f"Prompt cache: {cached_tokens}/{prompt_tokens} tokens cached "
+            f"(hit rate {self.prompt_cache_hit_rate:.1%})"
+        )
+    
+    @property
+    def prompt_cache_hit_rate(self) -> float:
+        """Fraction of prompt tokens served from OpenAI's prompt cache so far"""
+        if not self._prompt_tokens:
+            return 0.0
+        return self._cached_prompt_tokens / self._prompt_tokens
+    
+    @staticmethod
+    def _to_step(index: int, operation: Any) -> ActionStep:
+        """Convert a KubernetesOperation or OperationModel to the index'th ActionStep"""
+        # Operation fields are already validated, so skip ActionStep validation.
+        # The operation may belong to a cached plan, so the step gets its own dicts
+        return ActionStep.model_construct(
+            step_id=_STEP_IDS[index] if index < len(_STEP_IDS) else f"step_{index+1}",
+            action=operation.action.value,
+            resource_type=operation.resource_type.value,
+            resource_name=operation.resource_name,
+            namespace=operation.namespace,
+            manifest=copy.deepcopy(operation.manifest),
+            parameters=copy.deepcopy(operation.parameters) if operation.parameters else {},
+            dependencies=[]  # TODO: Extract dependencies
+        )
+    
+    @classmethod
+    def _to_steps(cls, execution_plan: ExecutionPlan) -> List[ActionStep]:
+        """Convert an execution plan's operations to ActionSteps"""
+        return [cls._to_step(i, operation) for i, operation in enumerate(execution_plan.operations)]
+    
+    def _plan_cache_key(self, user_request: str, context: Optional[Dict[str, Any]] = None) -> Optional[tuple]:
+        """Key plans on everything that determines the LLM output (None if uncacheable)"""
+        context_digest = None
+        if context:
+            try:
+                context_json = json.dumps(context, sort_keys=True)
+            except (TypeError, ValueError):
+                return None
+            context_digest = hashlib.blake2b(context_json.encode(), digest_size=16).hexdigest()
+        return (self._model, _SYSTEM_PROMPT_HASH, _normalize_request(user_request), context_digest)
+    
+    def _cached_plan(self, cache_key: Optional[tuple], cache_bypass: bool, span) -> Optional[PlanModel]:
+        """Look up a cached plan, recording the hit or miss on the span"""
+        plan_data = None
+        if cache_key is not None and not cache_bypass:
+            plan_data = self._plan_cache.get(cache_key)
+        if span.is_recording():
+            span.set_attribute("cache_hit", plan_data is not None)
+        return plan_data
+    
+    def invalidate_plan(self, user_request: str, context: Optional[Dict[str, Any]] = None):
+        """Forget a cached plan (e.g. after it failed validation)"""
+        cache_key = self._plan_cache_key(user_request, context)
+        if cache_key is not None:
+            self._plan_cache.pop(cache_key)
+    
+    def _build_prompt(self, user_request: str, context: Optional[Dict[str, Any]] = None) -> List[BaseMessage]:
+        """Build the LLM messages: the shared system message plus the request"""
         context_str = ""
         if context:
             context_str = f"\nContext: {json.dumps(context, indent=2)}"
         
-        return f"""
-{self.system_prompt}
-
+        return [
+            self._system_msg,
+            HumanMessage(content=f"""
 User Request: {user_request}{context_str}
 
 Please respond with a JSON object containing the execution plan.
-"""
+""")
+        ]
     
-    def _parse_llm_response(self, response: str) -> Dict:
+    def _parse_llm_response(self, response: str) -> PlanModel:
         """Parse and validate LLM response"""
         try:
             # Clean response (remove markdown formatting if present)
-            response = response.strip()
-            if response.startswith("```json"):
-                response = response[7:]
-            if response.endswith("```"):
-                response = response[:-3]
+            response = _FENCE_RE.sub("", response)
             
-            plan_data = json.loads(response)
+            return PlanModel.model_validate_json(response)
             
-            # Validate required fields
-            if "description" not in plan_data:
-                raise ValueError("Missing 'description' field in plan")
-            if "operations" not in plan_data:
-                raise ValueError("Missing 'operations' field in plan")
-            
-            return plan_data
-            
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response from LLM: {str(e)}")
+        except ValidationError as e:
+            raise ValueError(f"Invalid plan response from LLM: {str(e)}")
     
-    def _create_execution_plan(self, plan_data: Dict) -> ExecutionPlan:
-        """Create ExecutionPlan object from parsed data"""
-        operations = []
-        
-        for op_data in plan_data.get("operations", []):
-            operation = KubernetesOperation(
-                action=KubernetesAction(op_data["action"].upper()),
-                resource_type=ResourceType(op_data["resource_type"].lower()),
-                resource_name=op_data.get("resource_name"),
-                namespace=op_data.get("namespace", "default"),
-                manifest=op_data.get("manifest"),
-                parameters=op_data.get("parameters", {})
+    def _create_execution_plan(self, plan_data: PlanModel) -> ExecutionPlan:
+        """Create ExecutionPlan object from a validated plan"""
+        # Fields were validated while parsing, so skip re-validating them
+        operations = [
+            KubernetesOperation.model_construct(
+                action=op.action,
+                resource_type=op.resource_type,
+                resource_name=op.resource_name,
+                namespace=op.namespace,
+                manifest=op.manifest,
+                parameters=op.parameters or {}
             )
-            operations.append(operation)
+            for op in plan_data.operations
+        ]
         
         return ExecutionPlan(
-            description=plan_data["description"],
+            description=plan_data.description,
             operations=operations,
-            estimated_duration=plan_data.get("estimated_duration", 60)
+            estimated_duration=plan_data.estimated_duration
         )
     
     async def validate_plan(self, plan: ExecutionPlan) -> List[str]:
         """Validate execution plan for potential issues"""
         issues = []
         
-        # Check for resource naming conflicts
-        resource_names = {}
+        # One pass collects created resources and namespaces (enum members compare by identity)
+        create = KubernetesAction.CREATE
+        namespace_type = ResourceType.NAMESPACE
+        created_resources = set()
+        created_namespaces = set()
+        namespaced_creates = []
         for op in plan.operations:
-            if op.action in [KubernetesAction.CREATE] and op.resource_name:
-                key = f"{op.namespace}/{op.resource_type}/{op.resource_name}"
-                if key in resource_names:
+            if op.action is not create:
+                continue
+            if op.resource_type is namespace_type:
+                created_namespaces.add(op.resource_name)
+            else:
+                namespaced_creates.append(op)
+            
+            # Check for resource naming conflicts
+            if op.resource_name:
+                rtype_s = op.resource_type.value
+                key = f"{op.namespace}/{rtype_s}/{op.resource_name}"
+                if key in created_resources:
                     issues.append(f"Duplicate resource creation: {key}")
-                resource_names[key] = op
+                else:
+                    created_resources.add(key)
         
         # Check for missing dependencies
-        for op in plan.operations:
-            if op.action == KubernetesAction.CREATE and op.resource_type != ResourceType.NAMESPACE:
-                # Check if namespace exists in plan
-                ns_created = any(
-                    other_op.action == KubernetesAction.CREATE 
-                    and other_op.resource_type == ResourceType.NAMESPACE
-                    and other_op.resource_name == op.namespace
-                    for other_op in plan.operations
-                )
-                if op.namespace != "default" and not ns_created:
-                    issues.append(f"Namespace '{op.namespace}' not created before use")
+        for op in namespaced_creates:
+            if op.namespace != "default" and op.namespace not in created_namespaces:
+                issues.append(f"Namespace '{op.namespace}' not created before use")
         
         return issues
@@ -4,7 +4,7 @@ Core state models for the AutoOps multi-agent system
 
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Union
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
@@ -71,6 +71,8 @@ class KubernetesOperation(BaseModel):
     namespace: str = "default"
     manifest: Optional[Dict[str, Any]] = None
     parameters: Dict[str, Any] = Field(default_factory=dict)
+    # "cache" reads (GET/LIST) may be served from the apiserver watch cache
+    consistency: Literal["strong", "cache"] = "cache"
 
 
 class ActionStep(BaseModel):
@@ -93,7 +95,16 @@ class ExecutionPlan(BaseModel):
     operations: List[KubernetesOperation]
     dependencies: List[UUID] = Field(default_factory=list)
     estimated_duration: Optional[int] = None  # seconds
+    fail_fast: bool = False  # skip operations not yet started after the first failure
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    def summary(self) -> Dict[str, Any]:
+        """Lightweight view of the plan without operation manifests"""
+        return {
+            "description": self.description,
+            "op_count": len(self.operations),
+            "estimated_duration": self.estimated_duration
+        }
 
 
 class ExecutionResult(BaseModel):
@@ -106,6 +117,14 @@ class ExecutionResult(BaseModel):
     started_at: datetime = Field(default_factory=datetime.utcnow)
     completed_at: Optional[datetime] = None
     duration: Optional[float] = None  # seconds
+    
+    def summary(self) -> Dict[str, Any]:
+        """Lightweight view of the result without the operation or API response"""
+        return {
+            "status": self.status.value,
+            "error": self.error,
+            "duration": self.duration
+        }
 
 
 class AutoOpsState(BaseModel):
@@ -3,20 +3,30 @@ FastAPI Dashboard for AutoOps real-time monitoring
 """
 
 import asyncio
-import json
+import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set
 
+import orjson
+import ormsgpack
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from pydantic import BaseModel
 
 from ..agents.orchestrator import AutoOpsOrchestrator
 from ..utils.task_manager_simple import task_manager, TaskPriority
 from ..monitoring.tracing_simple import setup_tracing, initialize_tracing, instrument_fastapi
-from config.settings import settings
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Dashboard page, stylesheet and script
+STATIC_DIR = Path(__file__).parent / "static"
 
 
 class TaskRequest(BaseModel):
@@ -34,43 +44,64 @@ class TaskResponse(BaseModel):
 
 
 class ConnectionManager:
-    """Manages WebSocket connections for real-time updates"""
+    """
+    Manages WebSocket connections for real-time updates.
+    
+    Messages are JSON text frames by default; clients that ask for msgpack
+    receive compact binary frames instead.
+    """
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
+        self.msgpack_connections: Set[WebSocket] = set()
     
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, websocket: WebSocket, use_msgpack: bool = False):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
+        if use_msgpack:
+            self.msgpack_connections.add(websocket)
     
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
+        self.msgpack_connections.discard(websocket)
     
     async def send_message(self, message: dict, websocket: WebSocket):
         try:
-            await websocket.send_text(json.dumps(message))
+            if websocket in self.msgpack_connections:
+                await websocket.send_bytes(ormsgpack.packb(message))
+            else:
+                await websocket.send_text(orjson.dumps(message).decode())
         except:
             self.disconnect(websocket)
     
     async def broadcast(self, message: dict):
-        disconnected = []
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(json.dumps(message))
-            except:
-                disconnected.append(connection)
+        # Encode at most once per format and send to every client concurrently
+        connections = list(self.active_connections)
+        text_payload = binary_payload = None
+        sends = []
+        for connection in connections:
+            if connection in self.msgpack_connections:
+                if binary_payload is None:
+                    binary_payload = ormsgpack.packb(message)
+                sends.append(connection.send_bytes(binary_payload))
+            else:
+                if text_payload is None:
+                    text_payload = orjson.dumps(message).decode()
+                sends.append(connection.send_text(text_payload))
+        results = await asyncio.gather(*sends, return_exceptions=True)
         
         # Remove disconnected clients
-        for connection in disconnected:
-            self.disconnect(connection)
+        for connection, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.disconnect(connection)
 
 
 # Initialize FastAPI app
 app = FastAPI(
     title="AutoOps Dashboard",
     description="Real-time monitoring dashboard for AutoOps multi-agent system",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Initialize tracing
@@ -86,265 +117,104 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress static assets and larger JSON payloads (e.g. task lists)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Static files are sent with ETag/Last-Modified and answer If-None-Match with 304
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
+
 # Connection manager
 manager = ConnectionManager()
 
 # Global orchestrator instance
 orchestrator = AutoOpsOrchestrator()
 
+# Pending task-change broadcasts (kept referenced until they finish)
+_pending_broadcasts: Set[asyncio.Task] = set()
+
+
+def _push_task_change(task_info: Dict[str, Any]):
+    """Task manager listener: push the changed task to clients instead of having them poll"""
+    if not manager.active_connections:
+        return
+    broadcast = asyncio.create_task(manager.broadcast({
+        "type": "task_list",
+        "task": task_info,
+        "timestamp": datetime.utcnow()
+    }))
+    _pending_broadcasts.add(broadcast)
+    broadcast.add_done_callback(_pending_broadcasts.discard)
+
+
+async def _broadcast_metrics(interval: float = 1.0):
+    """Gather metrics once per tick and fan them out to every connected client"""
+    while True:
+        await asyncio.sleep(interval)
+        if not manager.active_connections:
+            continue
+        try:
+            metrics = await task_manager.get_metrics()
+            await manager.broadcast({
+                "type": "metrics",
+                "data": metrics,
+                "timestamp": datetime.utcnow()
+            })
+        except Exception:
+            logger.exception("Failed to broadcast metrics")
+
 
-@app.on_event("startup")
-async def startup_event():
-    """Initialize services on startup"""
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Start the task manager, task-change pushes and the metrics broadcaster
+    
+    Applications that install their own lifespan (main.py) must enter this
+    one from it; Starlette runs only a single lifespan per app.
+    """
     await task_manager.start()
+    task_manager.add_listener(_push_task_change)
+    metrics_task = asyncio.create_task(_broadcast_metrics())
+    try:
+        yield
+    finally:
+        metrics_task.cancel()
+        await asyncio.gather(metrics_task, return_exceptions=True)
+        task_manager.remove_listener(_push_task_change)
+        await task_manager.stop()
 
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    await task_manager.stop()
+app.router.lifespan_context = lifespan
 
 
-@app.get("/", response_class=HTMLResponse)
+@app.get("/", response_class=FileResponse)
 async def dashboard():
     """Serve the main dashboard"""
-    return """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>AutoOps Dashboard</title>
-        <style>
-            body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-            .container { max-width: 1200px; margin: 0 auto; }
-            .header { background: #2c3e50; color: white; padding: 20px; border-radius: 8px; margin-bottom: 20px; }
-            .stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 20px; }
-            .stat-card { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .stat-value { font-size: 2em; font-weight: bold; color: #3498db; }
-            .task-form { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); margin-bottom: 20px; }
-            .task-list { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-            .task-item { border-bottom: 1px solid #eee; padding: 10px 0; }
-            .task-status { padding: 4px 8px; border-radius: 4px; color: white; font-size: 0.8em; }
-            .status-pending { background: #f39c12; }
-            .status-executing { background: #3498db; }
-            .status-completed { background: #27ae60; }
-            .status-failed { background: #e74c3c; }
-            .status-cancelled { background: #95a5a6; }
-            input, textarea, select, button { margin: 5px; padding: 8px; border: 1px solid #ddd; border-radius: 4px; }
-            button { background: #3498db; color: white; cursor: pointer; }
-            button:hover { background: #2980b9; }
-            .log { background: #2c3e50; color: #ecf0f1; padding: 10px; border-radius: 4px; max-height: 300px; overflow-y: auto; font-family: monospace; }
-        </style>
-    </head>
-    <body>
-        <div class="container">
-            <div class="header">
-                <h1>🤖 AutoOps Dashboard</h1>
-                <p>Multi-Agent Kubernetes Orchestrator</p>
-            </div>
-            
-            <div class="stats" id="stats">
-                <!-- Stats will be populated by JavaScript -->
-            </div>
-            
-            <div class="task-form">
-                <h3>Submit New Task</h3>
-                <textarea id="taskRequest" placeholder="Enter your Kubernetes request in natural language..." rows="3" style="width: 100%;"></textarea>
-                <select id="taskPriority">
-                    <option value="normal">Normal Priority</option>
-                    <option value="low">Low Priority</option>
-                    <option value="high">High Priority</option>
-                    <option value="critical">Critical Priority</option>
-                </select>
-                <button onclick="submitTask()">Submit Task</button>
-            </div>
-            
-            <div class="task-list">
-                <h3>Recent Tasks</h3>
-                <div id="taskList">
-                    <!-- Tasks will be populated by JavaScript -->
-                </div>
-            </div>
-            
-            <div class="task-list">
-                <h3>Real-time Log</h3>
-                <div class="log" id="logOutput">
-                    Connecting to WebSocket...
-                </div>
-            </div>
-        </div>
-
-        <script>
-            let ws = null;
-            
-            function connectWebSocket() {
-                const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
-                ws = new WebSocket(`${protocol}//${window.location.host}/ws`);
-                
-                ws.onopen = function(event) {
-                    addLog('WebSocket connected');
-                };
-                
-                ws.onmessage = function(event) {
-                    const data = JSON.parse(event.data);
-                    handleWebSocketMessage(data);
-                };
-                
-                ws.onclose = function(event) {
-                    addLog('WebSocket disconnected. Reconnecting...');
-                    setTimeout(connectWebSocket, 3000);
-                };
-                
-                ws.onerror = function(error) {
-                    addLog('WebSocket error: ' + error);
-                };
-            }
-            
-            function handleWebSocketMessage(data) {
-                if (data.type === 'task_update') {
-                    addLog(`Task ${data.task_id}: ${data.status}`);
-                    loadTasks();
-                } else if (data.type === 'metrics') {
-                    updateStats(data.data);
-                }
-            }
-            
-            function addLog(message) {
-                const log = document.getElementById('logOutput');
-                const timestamp = new Date().toLocaleTimeString();
-                log.innerHTML += `<div>[${timestamp}] ${message}</div>`;
-                log.scrollTop = log.scrollHeight;
-            }
-            
-            function updateStats(metrics) {
-                const statsContainer = document.getElementById('stats');
-                statsContainer.innerHTML = `
-                    <div class="stat-card">
-                        <div class="stat-value">${metrics.total_tasks}</div>
-                        <div>Total Tasks</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">${metrics.executing_tasks}</div>
-                        <div>Executing</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">${metrics.completed_tasks}</div>
-                        <div>Completed</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">${metrics.failed_tasks}</div>
-                        <div>Failed</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">${metrics.active_tasks}</div>
-                        <div>Active Workers</div>
-                    </div>
-                    <div class="stat-card">
-                        <div class="stat-value">${metrics.queue_size}</div>
-                        <div>Queue Size</div>
-                    </div>
-                `;
-            }
-            
-            async function submitTask() {
-                const request = document.getElementById('taskRequest').value.trim();
-                const priority = document.getElementById('taskPriority').value;
-                
-                if (!request) {
-                    alert('Please enter a request');
-                    return;
-                }
-                
-                try {
-                    const response = await fetch('/api/tasks', {
-                        method: 'POST',
-                        headers: {
-                            'Content-Type': 'application/json',
-                        },
-                        body: JSON.stringify({
-                            request: request,
-                            priority: priority
-                        })
-                    });
-                    
-                    const result = await response.json();
-                    
-                    if (response.ok) {
-                        document.getElementById('taskRequest').value = '';
-                        addLog(`Task submitted: ${result.task_id}`);
-                        loadTasks();
-                    } else {
-                        addLog(`Error: ${result.detail}`);
-                    }
-                } catch (error) {
-                    addLog(`Error submitting task: ${error}`);
-                }
-            }
-            
-            async function loadTasks() {
-                try {
-                    const response = await fetch('/api/tasks?limit=10');
-                    const tasks = await response.json();
-                    
-                    const taskList = document.getElementById('taskList');
-                    taskList.innerHTML = tasks.map(task => `
-                        <div class="task-item">
-                            <div><strong>${task.task_id}</strong></div>
-                            <div>${task.request.substring(0, 100)}${task.request.length > 100 ? '...' : ''}</div>
-                            <div>
-                                <span class="task-status status-${task.status}">${task.status.toUpperCase()}</span>
-                                Priority: ${task.priority} | 
-                                Created: ${new Date(task.created_at).toLocaleString()}
-                                ${task.error ? `| Error: ${task.error}` : ''}
-                            </div>
-                        </div>
-                    `).join('');
-                } catch (error) {
-                    addLog(`Error loading tasks: ${error}`);
-                }
-            }
-            
-            async function loadMetrics() {
-                try {
-                    const response = await fetch('/api/metrics');
-                    const metrics = await response.json();
-                    updateStats(metrics);
-                } catch (error) {
-                    console.error('Error loading metrics:', error);
-                }
-            }
-            
-            // Initialize
-            connectWebSocket();
-            loadTasks();
-            loadMetrics();
-            
-            // Refresh data periodically
-            setInterval(loadTasks, 5000);
-            setInterval(loadMetrics, 2000);
-        </script>
-    </body>
-    </html>
-    """
+    return FileResponse(STATIC_DIR / "index.html")
 
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time updates"""
-    await manager.connect(websocket)
+    """
+    WebSocket endpoint for real-time updates
+    
+    Connect with ?format=msgpack (or an Accept: application/msgpack header)
+    to receive msgpack binary frames instead of JSON text.
+    """
+    use_msgpack = (
+        websocket.query_params.get("format") == "msgpack"
+        or "application/msgpack" in websocket.headers.get("accept", "")
+    )
+    await manager.connect(websocket, use_msgpack=use_msgpack)
     try:
+        # Updates are pushed by broadcasts; just wait for the client to go away
         while True:
-            # Send periodic updates
-            await asyncio.sleep(1)
-            
-            # Send metrics update
-            metrics = await task_manager.get_metrics()
-            await manager.send_message({
-                "type": "metrics",
-                "data": metrics,
-                "timestamp": datetime.utcnow().isoformat()
-            }, websocket)
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
             
     except WebSocketDisconnect:
+        pass
+    finally:
         manager.disconnect(websocket)
 
 
@@ -365,7 +235,7 @@ async def submit_task(task_request: TaskRequest, background_tasks: BackgroundTas
                 "type": "task_update",
                 "task_id": task_id,
                 "status": "submitted",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": datetime.utcnow()
             }
         )
         
@@ -414,7 +284,7 @@ async def cancel_task(task_id: str, background_tasks: BackgroundTasks):
             "type": "task_update",
             "task_id": task_id,
             "status": "cancelled",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow()
         }
     )
     
@@ -436,26 +306,32 @@ async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": datetime.utcnow(),
         "version": "1.0.0"
     }
 
 
 @app.get("/api/workflow/{request_id}")
-async def get_workflow_status(request_id: str):
-    """Get workflow status for a specific request"""
+async def get_workflow_status(request_id: str, full: bool = False):
+    """Get workflow status for a specific request (?full=true for the complete plan)"""
     try:
-        status = await orchestrator.get_workflow_status(request_id)
+        status = await orchestrator.get_workflow_status(request_id, full=full)
         return status
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 if __name__ == "__main__":
+    import sys
     import uvicorn
+    settings = get_settings()
+    # Single worker: tasks live in the in-process task manager
     uvicorn.run(
         app,
         host=settings.dashboard_host,
         port=settings.dashboard_port,
-        reload=settings.dev_mode
+        reload=settings.dev_mode,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        ws="websockets"
     )
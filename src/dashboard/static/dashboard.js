@@ -0,0 +1,172 @@
+let ws = null;
+let tasks = [];
+const MAX_TASKS = 10;
+
+function connectWebSocket() {
+    const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
+    ws = new WebSocket(`${protocol}//${window.location.host}/ws`);
+
+    ws.onopen = function(event) {
+        addLog('WebSocket connected');
+        // Resync anything missed while disconnected; pushes keep it current afterwards
+        loadTasks();
+        loadMetrics();
+    };
+
+    ws.onmessage = function(event) {
+        lastPush = Date.now();
+        const data = JSON.parse(event.data);
+        handleWebSocketMessage(data);
+    };
+
+    ws.onclose = function(event) {
+        addLog('WebSocket disconnected. Reconnecting...');
+        setTimeout(connectWebSocket, 3000);
+    };
+
+    ws.onerror = function(error) {
+        addLog('WebSocket error: ' + error);
+    };
+}
+
+function handleWebSocketMessage(data) {
+    if (data.type === 'task_update') {
+        addLog(`Task ${data.task_id}: ${data.status}`);
+    } else if (data.type === 'task_list') {
+        upsertTask(data.task);
+    } else if (data.type === 'metrics') {
+        updateStats(data.data);
+    }
+}
+
+function addLog(message) {
+    const log = document.getElementById('logOutput');
+    const timestamp = new Date().toLocaleTimeString();
+    log.innerHTML += `<div>[${timestamp}] ${message}</div>`;
+    log.scrollTop = log.scrollHeight;
+}
+
+function updateStats(metrics) {
+    const statsContainer = document.getElementById('stats');
+    statsContainer.innerHTML = `
+        <div class="stat-card">
+            <div class="stat-value">${metrics.total_tasks}</div>
+            <div>Total Tasks</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${metrics.executing_tasks}</div>
+            <div>Executing</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${metrics.completed_tasks}</div>
+            <div>Completed</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${metrics.failed_tasks}</div>
+            <div>Failed</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${metrics.active_tasks}</div>
+            <div>Active Workers</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-value">${metrics.queue_size}</div>
+            <div>Queue Size</div>
+        </div>
+    `;
+}
+
+async function submitTask() {
+    const request = document.getElementById('taskRequest').value.trim();
+    const priority = document.getElementById('taskPriority').value;
+
+    if (!request) {
+        alert('Please enter a request');
+        return;
+    }
+
+    try {
+        const response = await fetch('/api/tasks', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                request: request,
+                priority: priority
+            })
+        });
+
+        const result = await response.json();
+
+        if (response.ok) {
+            document.getElementById('taskRequest').value = '';
+            addLog(`Task submitted: ${result.task_id}`);
+        } else {
+            addLog(`Error: ${result.detail}`);
+        }
+    } catch (error) {
+        addLog(`Error submitting task: ${error}`);
+    }
+}
+
+async function loadTasks() {
+    try {
+        const response = await fetch(`/api/tasks?limit=${MAX_TASKS}`);
+        tasks = await response.json();
+        renderTasks();
+    } catch (error) {
+        addLog(`Error loading tasks: ${error}`);
+    }
+}
+
+function upsertTask(task) {
+    const index = tasks.findIndex(t => t.task_id === task.task_id);
+    if (index >= 0) {
+        tasks[index] = task;
+    } else {
+        tasks.unshift(task);
+        tasks.length = Math.min(tasks.length, MAX_TASKS);
+    }
+    renderTasks();
+}
+
+function renderTasks() {
+    const taskList = document.getElementById('taskList');
+    taskList.innerHTML = tasks.map(task => `
+        <div class="task-item">
+            <div><strong>${task.task_id}</strong></div>
+            <div>${task.request.substring(0, 100)}${task.request.length > 100 ? '...' : ''}</div>
+            <div>
+                <span class="task-status status-${task.status}">${task.status.toUpperCase()}</span>
+                Priority: ${task.priority} | 
+                Created: ${new Date(task.created_at).toLocaleString()}
+                ${task.error ? `| Error: ${task.error}` : ''}
+            </div>
+        </div>
+    `).join('');
+}
+
+async function loadMetrics() {
+    try {
+        const response = await fetch('/api/metrics');
+        const metrics = await response.json();
+        updateStats(metrics);
+    } catch (error) {
+        console.error('Error loading metrics:', error);
+    }
+}
+
+// Fallback poll for when pushes are not arriving (socket down or reconnecting)
+const FALLBACK_POLL_MS = 15000;
+let lastPush = 0;
+
+setInterval(() => {
+    if (Date.now() - lastPush >= FALLBACK_POLL_MS) {
+        loadTasks();
+        loadMetrics();
+    }
+}, FALLBACK_POLL_MS);
+
+// Initialize; tasks and metrics load when the WebSocket opens and are pushed after that
+connectWebSocket();
@@ -3,51 +3,136 @@ Kubernetes Client - Interface for Kubernetes cluster operations
 """
 
 import asyncio
+import functools
 import yaml
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 
-from kubernetes import client, config
+from aiolimiter import AsyncLimiter
+from kubernetes import client
 from kubernetes.client.rest import ApiException
 from opentelemetry import trace
 
+from .kubeconfig import load_configuration
+from .projections import get_projection
 from ..monitoring.tracing_simple import get_tracer
-from config.settings import settings
+from config.settings import get_settings
 
 tracer = get_tracer(__name__)
 
+# (verb, resource_type) -> (API group attribute, method name)
+_OPERATIONS: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("create", "pod"): ("core_v1", "create_namespaced_pod"),
+    ("create", "deployment"): ("apps_v1", "create_namespaced_deployment"),
+    ("create", "service"): ("core_v1", "create_namespaced_service"),
+    ("create", "configmap"): ("core_v1", "create_namespaced_config_map"),
+    ("create", "secret"): ("core_v1", "create_namespaced_secret"),
+    ("create", "ingress"): ("networking_v1", "create_namespaced_ingress"),
+    ("create", "namespace"): ("core_v1", "create_namespace"),
+    ("create", "persistentvolumeclaim"): ("core_v1", "create_namespaced_persistent_volume_claim"),
+    ("create", "horizontalpodautoscaler"): ("autoscaling_v1", "create_namespaced_horizontal_pod_autoscaler"),
+    ("patch", "pod"): ("core_v1", "patch_namespaced_pod"),
+    ("patch", "deployment"): ("apps_v1", "patch_namespaced_deployment"),
+    ("patch", "service"): ("core_v1", "patch_namespaced_service"),
+    ("patch", "configmap"): ("core_v1", "patch_namespaced_config_map"),
+    ("patch", "secret"): ("core_v1", "patch_namespaced_secret"),
+    ("patch", "ingress"): ("networking_v1", "patch_namespaced_ingress"),
+    ("delete", "pod"): ("core_v1", "delete_namespaced_pod"),
+    ("delete", "deployment"): ("apps_v1", "delete_namespaced_deployment"),
+    ("delete", "service"): ("core_v1", "delete_namespaced_service"),
+    ("delete", "configmap"): ("core_v1", "delete_namespaced_config_map"),
+    ("delete", "secret"): ("core_v1", "delete_namespaced_secret"),
+    ("delete", "ingress"): ("networking_v1", "delete_namespaced_ingress"),
+    ("delete", "namespace"): ("core_v1", "delete_namespace"),
+    ("delete", "persistentvolumeclaim"): ("core_v1", "delete_namespaced_persistent_volume_claim"),
+    ("read", "pod"): ("core_v1", "read_namespaced_pod"),
+    ("read", "deployment"): ("apps_v1", "read_namespaced_deployment"),
+    ("read", "service"): ("core_v1", "read_namespaced_service"),
+    ("read", "configmap"): ("core_v1", "read_namespaced_config_map"),
+    ("read", "secret"): ("core_v1", "read_namespaced_secret"),
+    ("read", "ingress"): ("networking_v1", "read_namespaced_ingress"),
+    ("read", "namespace"): ("core_v1", "read_namespace"),
+    ("list", "pod"): ("core_v1", "list_namespaced_pod"),
+    ("list", "deployment"): ("apps_v1", "list_namespaced_deployment"),
+    ("list", "service"): ("core_v1", "list_namespaced_service"),
+    ("list", "namespace"): ("core_v1", "list_namespace"),
+    ("list", "node"): ("core_v1", "list_node"),
+    ("list_all", "pod"): ("core_v1", "list_pod_for_all_namespaces"),
+    ("list_all", "deployment"): ("apps_v1", "list_deployment_for_all_namespaces"),
+    ("list_all", "service"): ("core_v1", "list_service_for_all_namespaces"),
+}
+
+# Resource types whose API methods take no namespace argument
+_CLUSTER_SCOPED = frozenset({"namespace", "node"})
+
+# Items requested per page when listing
+_LIST_PAGE_SIZE = 500
+
 
 class KubernetesClient:
     """
     Kubernetes client wrapper for AutoOps operations
     """
     
-    def __init__(self):
-        self._load_config()
+    def __init__(self, configuration: Optional[client.Configuration] = None):
+        # An explicit configuration (e.g. a blank one in tests) skips kubeconfig loading
+        if configuration is None:
+            self._load_config()
+        else:
+            self.configuration = configuration
         self._initialize_clients()
     
     def _load_config(self):
         """Load Kubernetes configuration"""
+        settings = get_settings()
         try:
-            if settings.kubeconfig_path:
-                config.load_kube_config(config_file=settings.kubeconfig_path)
-            else:
-                # Try in-cluster config first, then local config
-                try:
-                    config.load_incluster_config()
-                except config.ConfigException:
-                    config.load_kube_config()
+            self.configuration = load_configuration(settings.kubeconfig_path)
         except Exception as e:
             raise Exception(f"Failed to load Kubernetes config: {str(e)}")
     
     def _initialize_clients(self):
         """Initialize Kubernetes API clients"""
-        self.api_client = client.ApiClient()
-        self.core_v1 = client.CoreV1Api()
-        self.apps_v1 = client.AppsV1Api()
-        self.networking_v1 = client.NetworkingV1Api()
-        self.autoscaling_v1 = client.AutoscalingV1Api()
-        self.storage_v1 = client.StorageV1Api()
+        settings = get_settings()
+        max_workers = settings.max_concurrent_tasks
+        
+        # One connection pool shared by every API group, sized to the worker threads
+        self.configuration.connection_pool_maxsize = max_workers
+        self.api_client = client.ApiClient(self.configuration)
+        # Large list responses come back gzip-compressed; urllib3 inflates them transparently
+        self.api_client.set_default_header("Accept-Encoding", "gzip")
+        self.core_v1 = client.CoreV1Api(self.api_client)
+        self.apps_v1 = client.AppsV1Api(self.api_client)
+        self.networking_v1 = client.NetworkingV1Api(self.api_client)
+        self.autoscaling_v1 = client.AutoscalingV1Api(self.api_client)
+        self.storage_v1 = client.StorageV1Api(self.api_client)
+        # Bound API methods, filled on first use by _resolve()
+        self._resolved: Dict[Tuple[str, str], Callable] = {}
+        
+        # The kubernetes client is blocking; API calls run on these threads
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="k8s-api")
+        # Token bucket protecting the API server: bursts up to the limit, refilled at the QPS rate
+        burst = settings.kubernetes_api_burst
+        self._limiter = AsyncLimiter(burst, burst / settings.kubernetes_api_qps)
+    
+    async def _call(self, method, *args, **kwargs) -> Any:
+        """Run a blocking API method off the event loop, within the API rate limit"""
+        async with self._limiter:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+    
+    def _resolve(self, verb: str, resource_type: str) -> Callable:
+        """Resolve (verb, resource_type) to a bound API method, caching the result"""
+        key = (verb, resource_type)
+        method = self._resolved.get(key)
+        if method is None:
+            target = _OPERATIONS.get(key)
+            if target is None:
+                raise ValueError(f"Unsupported resource type for {verb}: {resource_type}")
+            api_attr, method_name = target
+            method = getattr(getattr(self, api_attr), method_name)
+            self._resolved[key] = method
+        return method
     
     async def create_resource(
         self, 
@@ -56,56 +141,27 @@ class KubernetesClient:
         manifest: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Create a Kubernetes resource"""
-        with tracer.start_as_current_span("k8s_create_resource") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("namespace", namespace)
-            
+        with tracer.start_as_current_span("k8s_create_resource", attributes={
+            "resource_type": resource_type,
+            "namespace": namespace
+        }) as span:
+            create = self._resolve("create", resource_type)
             try:
-                if resource_type == "pod":
-                    result = self.core_v1.create_namespaced_pod(
-                        namespace=namespace, body=manifest
-                    )
-                elif resource_type == "deployment":
-                    result = self.apps_v1.create_namespaced_deployment(
-                        namespace=namespace, body=manifest
-                    )
-                elif resource_type == "service":
-                    result = self.core_v1.create_namespaced_service(
-                        namespace=namespace, body=manifest
-                    )
-                elif resource_type == "configmap":
-                    result = self.core_v1.create_namespaced_config_map(
-                        namespace=namespace, body=manifest
-                    )
-                elif resource_type == "secret":
-                    result = self.core_v1.create_namespaced_secret(
-                        namespace=namespace, body=manifest
-                    )
-                elif resource_type == "ingress":
-                    result = self.networking_v1.create_namespaced_ingress(
-                        namespace=namespace, body=manifest
-                    )
-                elif resource_type == "namespace":
-                    result = self.core_v1.create_namespace(body=manifest)
-                elif resource_type == "persistentvolumeclaim":
-                    result = self.core_v1.create_namespaced_persistent_volume_claim(
-                        namespace=namespace, body=manifest
-                    )
-                elif resource_type == "horizontalpodautoscaler":
-                    result = self.autoscaling_v1.create_namespaced_horizontal_pod_autoscaler(
-                        namespace=namespace, body=manifest
-                    )
+                if resource_type in _CLUSTER_SCOPED:
+                    result = await self._call(create, body=manifest)
                 else:
-                    raise ValueError(f"Unsupported resource type: {resource_type}")
+                    result = await self._call(create, namespace=namespace, body=manifest)
                 
-                span.set_attribute("success", True)
+                span.set_status("OK")
                 return self._serialize_k8s_object(result)
                 
             except ApiException as e:
-                span.record_exception(e)
+                # Error type and code are enough to find the call; skip the traceback
+                span.set_attribute("error.type", type(e).__name__)
+                span.set_attribute("error.code", e.status)
+                span.set_status("ERROR", f"{e.status} - {e.reason}")
                 raise Exception(f"Kubernetes API error: {e.status} - {e.reason}")
     
-    @tracer.start_as_current_span("k8s_update_resource")
     async def update_resource(
         self, 
         resource_type: str, 
@@ -114,47 +170,25 @@ class KubernetesClient:
         manifest: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Update a Kubernetes resource"""
-        with tracer.start_as_current_span("update_operation") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("resource_name", name)
-            span.set_attribute("namespace", namespace)
-            
+        with tracer.start_as_current_span("k8s_update_resource", attributes={
+            "resource_type": resource_type,
+            "resource_name": name,
+            "namespace": namespace
+        }) as span:
+            patch = self._resolve("patch", resource_type)
             try:
-                if resource_type == "pod":
-                    result = self.core_v1.patch_namespaced_pod(
-                        name=name, namespace=namespace, body=manifest
-                    )
-                elif resource_type == "deployment":
-                    result = self.apps_v1.patch_namespaced_deployment(
-                        name=name, namespace=namespace, body=manifest
-                    )
-                elif resource_type == "service":
-                    result = self.core_v1.patch_namespaced_service(
-                        name=name, namespace=namespace, body=manifest
-                    )
-                elif resource_type == "configmap":
-                    result = self.core_v1.patch_namespaced_config_map(
-                        name=name, namespace=namespace, body=manifest
-                    )
-                elif resource_type == "secret":
-                    result = self.core_v1.patch_namespaced_secret(
-                        name=name, namespace=namespace, body=manifest
-                    )
-                elif resource_type == "ingress":
-                    result = self.networking_v1.patch_namespaced_ingress(
-                        name=name, namespace=namespace, body=manifest
-                    )
-                else:
-                    raise ValueError(f"Unsupported resource type for update: {resource_type}")
+                result = await self._call(patch, name=name, namespace=namespace, body=manifest)
                 
-                span.set_attribute("success", True)
+                span.set_status("OK")
                 return self._serialize_k8s_object(result)
                 
             except ApiException as e:
-                span.record_exception(e)
+                # Error type and code are enough to find the call; skip the traceback
+                span.set_attribute("error.type", type(e).__name__)
+                span.set_attribute("error.code", e.status)
+                span.set_status("ERROR", f"{e.status} - {e.reason}")
                 raise Exception(f"Kubernetes API error: {e.status} - {e.reason}")
     
-    @tracer.start_as_current_span("k8s_delete_resource")
     async def delete_resource(
         self, 
         resource_type: str, 
@@ -162,53 +196,28 @@ class KubernetesClient:
         namespace: str
     ) -> Dict[str, Any]:
         """Delete a Kubernetes resource"""
-        with tracer.start_as_current_span("delete_operation") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("resource_name", name)
-            span.set_attribute("namespace", namespace)
-            
+        with tracer.start_as_current_span("k8s_delete_resource", attributes={
+            "resource_type": resource_type,
+            "resource_name": name,
+            "namespace": namespace
+        }) as span:
+            delete = self._resolve("delete", resource_type)
             try:
-                if resource_type == "pod":
-                    result = self.core_v1.delete_namespaced_pod(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "deployment":
-                    result = self.apps_v1.delete_namespaced_deployment(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "service":
-                    result = self.core_v1.delete_namespaced_service(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "configmap":
-                    result = self.core_v1.delete_namespaced_config_map(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "secret":
-                    result = self.core_v1.delete_namespaced_secret(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "ingress":
-                    result = self.networking_v1.delete_namespaced_ingress(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "namespace":
-                    result = self.core_v1.delete_namespace(name=name)
-                elif resource_type == "persistentvolumeclaim":
-                    result = self.core_v1.delete_namespaced_persistent_volume_claim(
-                        name=name, namespace=namespace
-                    )
+                if resource_type in _CLUSTER_SCOPED:
+                    result = await self._call(delete, name=name)
                 else:
-                    raise ValueError(f"Unsupported resource type for deletion: {resource_type}")
+                    result = await self._call(delete, name=name, namespace=namespace)
                 
-                span.set_attribute("success", True)
+                span.set_status("OK")
                 return self._serialize_k8s_object(result)
                 
             except ApiException as e:
-                span.record_exception(e)
+                # Error type and code are enough to find the call; skip the traceback
+                span.set_attribute("error.type", type(e).__name__)
+                span.set_attribute("error.code", e.status)
+                span.set_status("ERROR", f"{e.status} - {e.reason}")
                 raise Exception(f"Kubernetes API error: {e.status} - {e.reason}")
     
-    @tracer.start_as_current_span("k8s_scale_deployment")
     async def scale_deployment(
         self, 
         name: str, 
@@ -216,33 +225,28 @@ class KubernetesClient:
         replicas: int
     ) -> Dict[str, Any]:
         """Scale a deployment"""
-        with tracer.start_as_current_span("scale_operation") as span:
-            span.set_attribute("deployment_name", name)
-            span.set_attribute("namespace", namespace)
-            span.set_attribute("replicas", replicas)
-            
+        with tracer.start_as_current_span("k8s_scale_deployment", attributes={
+            "deployment_name": name,
+            "namespace": namespace,
+            "replicas": replicas
+        }) as span:
             try:
-                # Get current deployment
-                deployment = self.apps_v1.read_namespaced_deployment(
-                    name=name, namespace=namespace
+                # One patch to the scale subresource; no read of the full deployment
+                result = await self._call(
+                    self.apps_v1.patch_namespaced_deployment_scale,
+                    name=name, namespace=namespace, body={"spec": {"replicas": replicas}}
                 )
                 
-                # Update replicas
-                deployment.spec.replicas = replicas
-                
-                # Apply update
-                result = self.apps_v1.patch_namespaced_deployment(
-                    name=name, namespace=namespace, body=deployment
-                )
-                
-                span.set_attribute("success", True)
+                span.set_status("OK")
                 return self._serialize_k8s_object(result)
                 
             except ApiException as e:
-                span.record_exception(e)
+                # Error type and code are enough to find the call; skip the traceback
+                span.set_attribute("error.type", type(e).__name__)
+                span.set_attribute("error.code", e.status)
+                span.set_status("ERROR", f"{e.status} - {e.reason}")
                 raise Exception(f"Kubernetes API error: {e.status} - {e.reason}")
     
-    @tracer.start_as_current_span("k8s_get_resource")
     async def get_resource(
         self, 
         resource_type: str, 
@@ -250,92 +254,78 @@ class KubernetesClient:
         namespace: str
     ) -> Dict[str, Any]:
         """Get a specific Kubernetes resource"""
-        with tracer.start_as_current_span("get_operation") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("resource_name", name)
-            span.set_attribute("namespace", namespace)
-            
+        with tracer.start_as_current_span("k8s_get_resource", attributes={
+            "resource_type": resource_type,
+            "resource_name": name,
+            "namespace": namespace
+        }) as span:
+            read = self._resolve("read", resource_type)
             try:
-                if resource_type == "pod":
-                    result = self.core_v1.read_namespaced_pod(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "deployment":
-                    result = self.apps_v1.read_namespaced_deployment(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "service":
-                    result = self.core_v1.read_namespaced_service(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "configmap":
-                    result = self.core_v1.read_namespaced_config_map(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "secret":
-                    result = self.core_v1.read_namespaced_secret(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "ingress":
-                    result = self.networking_v1.read_namespaced_ingress(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type == "namespace":
-                    result = self.core_v1.read_namespace(name=name)
+                if resource_type in _CLUSTER_SCOPED:
+                    result = await self._call(read, name=name)
                 else:
-                    raise ValueError(f"Unsupported resource type: {resource_type}")
+                    result = await self._call(read, name=name, namespace=namespace)
                 
-                span.set_attribute("success", True)
+                span.set_status("OK")
                 return self._serialize_k8s_object(result)
                 
             except ApiException as e:
-                span.record_exception(e)
+                # Error type and code are enough to find the call; skip the traceback
+                span.set_attribute("error.type", type(e).__name__)
+                span.set_attribute("error.code", e.status)
+                span.set_status("ERROR", f"{e.status} - {e.reason}")
                 raise Exception(f"Kubernetes API error: {e.status} - {e.reason}")
     
-    @tracer.start_as_current_span("k8s_list_resources")
     async def list_resources(
         self, 
         resource_type: str, 
         namespace: str = None
     ) -> List[Dict[str, Any]]:
-        """List Kubernetes resources"""
-        with tracer.start_as_current_span("list_operation") as span:
-            span.set_attribute("resource_type", resource_type)
-            if namespace:
-                span.set_attribute("namespace", namespace)
-            
+        """List Kubernetes resources, projected to their commonly used fields"""
+        with tracer.start_as_current_span("k8s_list_resources", attributes={
+            "resource_type": resource_type,
+            "namespace": namespace or "*"
+        }) as span:
             try:
-                if resource_type == "pod":
-                    if namespace:
-                        result = self.core_v1.list_namespaced_pod(namespace=namespace)
-                    else:
-                        result = self.core_v1.list_pod_for_all_namespaces()
-                elif resource_type == "deployment":
-                    if namespace:
-                        result = self.apps_v1.list_namespaced_deployment(namespace=namespace)
-                    else:
-                        result = self.apps_v1.list_deployment_for_all_namespaces()
-                elif resource_type == "service":
-                    if namespace:
-                        result = self.core_v1.list_namespaced_service(namespace=namespace)
-                    else:
-                        result = self.core_v1.list_service_for_all_namespaces()
-                elif resource_type == "namespace":
-                    result = self.core_v1.list_namespace()
-                elif resource_type == "node":
-                    result = self.core_v1.list_node()
-                else:
-                    raise ValueError(f"Unsupported resource type for listing: {resource_type}")
+                resources = [item async for item in self.iter_resources(resource_type, namespace)]
                 
-                span.set_attribute("success", True)
-                span.set_attribute("items_count", len(result.items))
+                span.set_status("OK")
+                span.set_attribute("items_count", len(resources))
                 
-                return [self._serialize_k8s_object(item) for item in result.items]
+                return resources
                 
             except ApiException as e:
-                span.record_exception(e)
+                # Error type and code are enough to find the call; skip the traceback
+                span.set_attribute("error.type", type(e).__name__)
+                span.set_attribute("error.code", e.status)
+                span.set_status("ERROR", f"{e.status} - {e.reason}")
                 raise Exception(f"Kubernetes API error: {e.status} - {e.reason}")
     
+    async def iter_resources(
+        self,
+        resource_type: str,
+        namespace: str = None,
+        page_size: int = _LIST_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield projected resources a page at a time, holding only one page in memory"""
+        # Cluster-scoped types, and namespaced types without a namespace, use the unscoped list
+        if resource_type in _CLUSTER_SCOPED:
+            list_fn, kwargs = self._resolve("list", resource_type), {}
+        elif namespace:
+            list_fn, kwargs = self._resolve("list", resource_type), {"namespace": namespace}
+        else:
+            list_fn, kwargs = self._resolve("list_all", resource_type), {}
+        
+        project = get_projection(resource_type)
+        continue_token = None
+        while True:
+            page = await self._call(list_fn, limit=page_size, _continue=continue_token, **kwargs)
+            for item in page.items:
+                yield project(item)
+            continue_token = page.metadata._continue
+            if not continue_token:
+                break
+    
     async def patch_resource(
         self, 
         resource_type: str, 
@@ -354,17 +344,28 @@ class KubernetesClient:
             # Fallback for objects that don't have to_dict method
             return self.api_client.sanitize_for_serialization(k8s_obj)
     
+    async def _count(self, list_fn) -> int:
+        """Count a list's items from a one-item page and the server's remainingItemCount"""
+        page = await self._call(list_fn, limit=1)
+        remaining = page.metadata.remaining_item_count
+        if remaining is None and page.metadata._continue:
+            # The server didn't report a count; fall back to the full list
+            return len((await self._call(list_fn)).items)
+        return len(page.items) + (remaining or 0)
+    
     async def get_cluster_info(self) -> Dict[str, Any]:
         """Get basic cluster information"""
         try:
-            version = client.VersionApi().get_code()
-            nodes = self.core_v1.list_node()
-            namespaces = self.core_v1.list_namespace()
+            version, nodes_count, namespaces_count = await asyncio.gather(
+                self._call(client.VersionApi(self.api_client).get_code),
+                self._count(self.core_v1.list_node),
+                self._count(self.core_v1.list_namespace)
+            )
             
             return {
                 "version": self._serialize_k8s_object(version),
-                "nodes_count": len(nodes.items),
-                "namespaces_count": len(namespaces.items),
+                "nodes_count": nodes_count,
+                "namespaces_count": namespaces_count,
                 "cluster_health": "healthy"  # Simplified health check
             }
         except Exception as e:
@@ -3,39 +3,179 @@ Simplified Kubernetes Client for AutoOps
 """
 
 import asyncio
+import functools
 import logging
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
-from kubernetes import client, config
+from aiolimiter import AsyncLimiter
+from kubernetes import client, watch
 from kubernetes.client.rest import ApiException
 
+from .kubeconfig import load_configuration
+from .projections import get_projection
 from ..monitoring.tracing_simple import get_tracer
 
 logger = logging.getLogger(__name__)
 tracer = get_tracer(__name__)
 
+# Seconds a completed list result keeps answering identical list calls
+_LIST_COALESCE_WINDOW = 0.1
+
+# Items requested per page when listing
+_LIST_PAGE_SIZE = 500
+
+# (verb, resource_type) -> (API group attribute, method name)
+_OPERATIONS: Dict[Tuple[str, str], Tuple[str, str]] = {
+    ("create", "deployment"): ("apps_v1", "create_namespaced_deployment"),
+    ("create", "service"): ("v1", "create_namespaced_service"),
+    ("create", "pod"): ("v1", "create_namespaced_pod"),
+    ("read", "deployment"): ("apps_v1", "read_namespaced_deployment"),
+    ("read", "service"): ("v1", "read_namespaced_service"),
+    ("read", "pod"): ("v1", "read_namespaced_pod"),
+    ("list", "deployment"): ("apps_v1", "list_namespaced_deployment"),
+    ("list", "service"): ("v1", "list_namespaced_service"),
+    ("list", "pod"): ("v1", "list_namespaced_pod"),
+    ("list_all", "deployment"): ("apps_v1", "list_deployment_for_all_namespaces"),
+    ("list_all", "service"): ("v1", "list_service_for_all_namespaces"),
+    ("list_all", "pod"): ("v1", "list_pod_for_all_namespaces"),
+    ("delete", "deployment"): ("apps_v1", "delete_namespaced_deployment"),
+    ("delete", "service"): ("v1", "delete_namespaced_service"),
+    ("delete", "pod"): ("v1", "delete_namespaced_pod"),
+}
+
+
+class _Informer:
+    """
+    Cached, projected view of one list call kept current by a watch
+    
+    The initial list runs through the client's rate-limited executor; a daemon
+    thread then follows the watch stream and hands each change to the event
+    loop, which owns the cache.
+    """
+    
+    def __init__(self, k8s: "KubernetesClient", list_fn: Callable, kwargs: Dict[str, Any], project: Callable):
+        self._k8s = k8s
+        self._list_fn = list_fn
+        self._kwargs = kwargs
+        self._project = project
+        self._items: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._resource_version: Optional[str] = None
+        self._watch: Optional[watch.Watch] = None
+        self._stopped = False
+        self._synced = asyncio.ensure_future(self._sync())
+        self.last_used = time.monotonic()
+    
+    async def items(self) -> List[Dict[str, Any]]:
+        """Current cached items (waits for the initial list on first use)"""
+        self.last_used = time.monotonic()
+        await asyncio.shield(self._synced)
+        return list(self._items.values())
+    
+    def stop(self):
+        self._stopped = True
+        self._synced.cancel()
+        if self._watch:
+            self._watch.stop()
+    
+    async def _sync(self):
+        result = await self._k8s._call(self._list_fn, **self._kwargs)
+        self._replace([self._project(item) for item in result.items])
+        self._resource_version = result.metadata.resource_version
+        loop = asyncio.get_running_loop()
+        threading.Thread(target=self._run_watch, args=(loop,), name="k8s-informer", daemon=True).start()
+    
+    def _replace(self, items: List[Dict[str, Any]]):
+        self._items = {(item["namespace"], item["name"]): item for item in items}
+    
+    def _apply(self, event_type: str, item: Dict[str, Any]):
+        key = (item["namespace"], item["name"])
+        if event_type == "DELETED":
+            self._items.pop(key, None)
+        else:
+            self._items[key] = item
+    
+    def _run_watch(self, loop: asyncio.AbstractEventLoop):
+        while not self._stopped:
+            self._watch = watch.Watch()
+            try:
+                for event in self._watch.stream(self._list_fn, resource_version=self._resource_version, **self._kwargs):
+                    if event["type"] not in ("ADDED", "MODIFIED", "DELETED"):
+                        continue
+                    obj = event["object"]
+                    self._resource_version = obj.metadata.resource_version
+                    loop.call_soon_threadsafe(self._apply, event["type"], self._project(obj))
+            except ApiException as e:
+                if e.status == 410:
+                    # Our resourceVersion was compacted away; relist and resume from the new one
+                    try:
+                        result = self._list_fn(**self._kwargs)
+                        items = [self._project(item) for item in result.items]
+                        self._resource_version = result.metadata.resource_version
+                        loop.call_soon_threadsafe(self._replace, items)
+                        continue
+                    except Exception as relist_error:
+                        logger.warning(f"Informer relist failed: {relist_error}")
+                else:
+                    logger.warning(f"Informer watch failed: {e}")
+                time.sleep(1)
+            except RuntimeError:
+                # Event loop closed
+                return
+            except Exception as e:
+                logger.warning(f"Informer watch failed: {e}")
+                time.sleep(1)
+
 
 class KubernetesClient:
     """Simplified Kubernetes client for basic operations"""
     
-    def __init__(self, kubeconfig_path: Optional[str] = None):
-        """Initialize the Kubernetes client"""
+    _shared: Optional["KubernetesClient"] = None
+    
+    def __init__(
+        self,
+        kubeconfig_path: Optional[str] = None,
+        pool_maxsize: Optional[int] = None,
+        qps: float = 50.0,
+        burst: int = 100,
+        informer_ttl: float = 300.0
+    ):
+        """
+        Initialize the Kubernetes client
+        
+        Args:
+            kubeconfig_path: Optional path to a kubeconfig file
+            pool_maxsize: Keep-alive connections to hold open to the API server
+            qps: Sustained API requests per second
+            burst: Requests allowed above the sustained rate after an idle period
+            informer_ttl: Seconds an unused list cache keeps its watch open
+        """
         self.logger = logging.getLogger(__name__)
+        self._resolved: Dict[Tuple[str, str], Callable] = {}
+        # The kubernetes client is blocking; API calls run on these threads, one per pooled connection
+        self._executor = ThreadPoolExecutor(max_workers=pool_maxsize, thread_name_prefix="k8s-api")
+        # Token bucket holding `burst` requests, refilled at `qps`
+        self._limiter = AsyncLimiter(burst, burst / qps)
+        # (resource_type, namespace or None for all) -> watch-backed list cache
+        self._informers: Dict[Tuple[str, Optional[str]], _Informer] = {}
+        self._informer_ttl = informer_ttl
+        # Request key -> in-flight (or briefly retained) read shared by identical callers
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
         
         try:
-            if kubeconfig_path:
-                config.load_kube_config(config_file=kubeconfig_path)
-            else:
-                # Try to load in-cluster config first, then local config
-                try:
-                    config.load_incluster_config()
-                except config.config_exception.ConfigException:
-                    config.load_kube_config()
+            configuration = load_configuration(kubeconfig_path)
+            if pool_maxsize:
+                configuration.connection_pool_maxsize = pool_maxsize
+            api_client = client.ApiClient(configuration)
+            # Large list responses come back gzip-compressed; urllib3 inflates them transparently
+            api_client.set_default_header("Accept-Encoding", "gzip")
             
-            # Initialize API clients
-            self.v1 = client.CoreV1Api()
-            self.apps_v1 = client.AppsV1Api()
-            self.networking_v1 = client.NetworkingV1Api()
+            # Initialize API clients on one shared connection pool
+            self.v1 = client.CoreV1Api(api_client)
+            self.apps_v1 = client.AppsV1Api(api_client)
+            self.networking_v1 = client.NetworkingV1Api(api_client)
             
         except Exception as e:
             self.logger.warning(f"Failed to initialize Kubernetes client: {e}")
@@ -43,6 +183,94 @@ class KubernetesClient:
             self.apps_v1 = None
             self.networking_v1 = None
     
+    def _resolve(self, verb: str, resource_type: str) -> Callable:
+        """Resolve (verb, resource_type) to a bound API method, caching the result"""
+        key = (verb, resource_type)
+        method = self._resolved.get(key)
+        if method is None:
+            target = _OPERATIONS.get((verb, resource_type.lower()))
+            if target is None:
+                raise ValueError(f"Unsupported resource type: {resource_type}")
+            api_attr, method_name = target
+            method = getattr(getattr(self, api_attr), method_name)
+            self._resolved[key] = method
+        return method
+    
+    async def _call(self, method: Callable, *args, **kwargs) -> Any:
+        """Run a blocking API method off the event loop, within the API rate limit"""
+        async with self._limiter:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+    
+    async def _coalesced(self, key: tuple, fetch: Callable[[], Awaitable], linger: float = 0.0) -> Any:
+        """
+        Share one request among concurrent callers with the same key
+        
+        A successful result is kept for `linger` seconds so tight bursts of
+        the same read also reuse it.
+        """
+        pending = self._in_flight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(fetch())
+            self._in_flight[key] = pending
+            
+            def release(future: asyncio.Future):
+                if linger and not future.cancelled() and future.exception() is None:
+                    asyncio.get_running_loop().call_later(linger, self._in_flight.pop, key, None)
+                else:
+                    self._in_flight.pop(key, None)
+            
+            pending.add_done_callback(release)
+        # Shielded so one cancelled caller doesn't cancel the shared request
+        return await asyncio.shield(pending)
+    
+    def _informer(self, resource_type: str, namespace: Optional[str]) -> _Informer:
+        """Get (starting if needed) the informer for a list, stopping idle ones"""
+        now = time.monotonic()
+        for key, idle in list(self._informers.items()):
+            if now - idle.last_used > self._informer_ttl:
+                idle.stop()
+                del self._informers[key]
+        
+        key = (resource_type.lower(), namespace)
+        informer = self._informers.get(key)
+        if informer is None:
+            if namespace is None:
+                list_fn, kwargs = self._resolve("list_all", resource_type), {}
+            else:
+                list_fn, kwargs = self._resolve("list", resource_type), {"namespace": namespace}
+            informer = _Informer(self, list_fn, kwargs, get_projection(resource_type))
+            self._informers[key] = informer
+        return informer
+    
+    async def _informer_items(self, resource_type: str, namespace: Optional[str]) -> List[Dict[str, Any]]:
+        informer = self._informer(resource_type, namespace)
+        try:
+            return await informer.items()
+        except Exception:
+            # Drop the failed informer so the next call retries the initial list
+            key = (resource_type.lower(), namespace)
+            if self._informers.get(key) is informer:
+                del self._informers[key]
+            raise
+    
+    def stop_informers(self):
+        """Close every informer watch"""
+        for informer in self._informers.values():
+            informer.stop()
+        self._informers.clear()
+    
+    def invalidate_discovery(self):
+        """Drop cached resource resolutions (e.g. after the API clients are rebuilt)"""
+        self._resolved.clear()
+    
+    @classmethod
+    def get_shared(cls, pool_maxsize: Optional[int] = None, **kwargs) -> "KubernetesClient":
+        """Get the process-wide client so agents reuse one kubeconfig load and connection pool"""
+        if cls._shared is None:
+            cls._shared = cls(pool_maxsize=pool_maxsize, **kwargs)
+        return cls._shared
+    
     async def create_resource(
         self, 
         resource_type: str, 
@@ -50,32 +278,18 @@ class KubernetesClient:
         manifest: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Create a Kubernetes resource"""
-        with tracer.start_as_current_span("k8s_create_resource") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("namespace", namespace)
-            
+        with tracer.start_as_current_span("k8s_create_resource", attributes={
+            "resource_type": resource_type,
+            "namespace": namespace
+        }) as span:
             try:
                 if not self.v1:
                     raise Exception("Kubernetes client not initialized")
                 
-                # Convert manifest to appropriate Kubernetes object
-                if resource_type.lower() == "deployment":
-                    body = client.V1Deployment(**manifest)
-                    result = self.apps_v1.create_namespaced_deployment(
-                        namespace=namespace, body=body
-                    )
-                elif resource_type.lower() == "service":
-                    body = client.V1Service(**manifest)
-                    result = self.v1.create_namespaced_service(
-                        namespace=namespace, body=body
-                    )
-                elif resource_type.lower() == "pod":
-                    body = client.V1Pod(**manifest)
-                    result = self.v1.create_namespaced_pod(
-                        namespace=namespace, body=body
-                    )
-                else:
-                    raise ValueError(f"Unsupported resource type: {resource_type}")
+                create = self._resolve("create", resource_type)
+                
+                # The manifest is sent as-is; building V1* models from it would only be serialized back
+                result = await self._call(create, namespace=namespace, body=manifest)
                 
                 span.set_status("OK")
                 return {"status": "created", "name": result.metadata.name}
@@ -89,40 +303,31 @@ class KubernetesClient:
         self, 
         resource_type: str, 
         name: str, 
-        namespace: str = "default"
+        namespace: str = "default",
+        resource_version: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
-        """Get a Kubernetes resource"""
-        with tracer.start_as_current_span("k8s_get_resource") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("name", name)
-            span.set_attribute("namespace", namespace)
-            
+        """
+        Get a Kubernetes resource
+        
+        Passing resource_version="0" allows the apiserver to answer from its
+        watch cache instead of a quorum read from etcd.
+        """
+        with tracer.start_as_current_span("k8s_get_resource", attributes={
+            "resource_type": resource_type,
+            "name": name,
+            "namespace": namespace
+        }) as span:
             try:
                 if not self.v1:
                     raise Exception("Kubernetes client not initialized")
                 
-                if resource_type.lower() == "deployment":
-                    result = self.apps_v1.read_namespaced_deployment(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type.lower() == "service":
-                    result = self.v1.read_namespaced_service(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type.lower() == "pod":
-                    result = self.v1.read_namespaced_pod(
-                        name=name, namespace=namespace
-                    )
-                else:
-                    raise ValueError(f"Unsupported resource type: {resource_type}")
+                resource = await self._coalesced(
+                    ("read", resource_type.lower(), namespace, name, resource_version),
+                    functools.partial(self._fetch_resource, resource_type, name, namespace, resource_version)
+                )
                 
                 span.set_status("OK")
-                return {
-                    "name": result.metadata.name,
-                    "namespace": result.metadata.namespace,
-                    "status": getattr(result, 'status', {}),
-                    "spec": getattr(result, 'spec', {})
-                }
+                return resource
                 
             except ApiException as e:
                 if e.status == 404:
@@ -138,43 +343,147 @@ class KubernetesClient:
     async def list_resources(
         self, 
         resource_type: str, 
-        namespace: str = "default"
+        namespace: str = "default",
+        all_namespaces: bool = False,
+        resource_version: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """List Kubernetes resources"""
-        with tracer.start_as_current_span("k8s_list_resources") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("namespace", namespace)
-            
+        """
+        List Kubernetes resources in a namespace, or across all namespaces
+        
+        With resource_version="0" (any cached state is acceptable) the list is
+        served from a watch-backed informer instead of a request per call.
+        """
+        with tracer.start_as_current_span("k8s_list_resources", attributes={
+            "resource_type": resource_type,
+            "namespace": "*" if all_namespaces else namespace
+        }) as span:
             try:
                 if not self.v1:
                     raise Exception("Kubernetes client not initialized")
                 
-                if resource_type.lower() == "deployment":
-                    result = self.apps_v1.list_namespaced_deployment(namespace=namespace)
-                elif resource_type.lower() == "service":
-                    result = self.v1.list_namespaced_service(namespace=namespace)
-                elif resource_type.lower() == "pod":
-                    result = self.v1.list_namespaced_pod(namespace=namespace)
-                else:
-                    raise ValueError(f"Unsupported resource type: {resource_type}")
+                if resource_version == "0":
+                    resources = await self._informer_items(resource_type, None if all_namespaces else namespace)
+                    span.set_status("OK")
+                    return resources
                 
-                resources = []
-                for item in result.items:
-                    resources.append({
-                        "name": item.metadata.name,
-                        "namespace": item.metadata.namespace,
-                        "status": getattr(item, 'status', {}),
-                        "spec": getattr(item, 'spec', {})
-                    })
+                scope = None if all_namespaces else namespace
+                resources = await self._coalesced(
+                    ("list", resource_type.lower(), scope, resource_version),
+                    functools.partial(self._fetch_list, resource_type, scope, resource_version),
+                    linger=_LIST_COALESCE_WINDOW
+                )
                 
                 span.set_status("OK")
-                return resources
+                # Callers share the cached result; give each its own list
+                return list(resources)
                 
             except Exception as e:
                 span.set_status("ERROR", str(e))
                 self.logger.error(f"Failed to list {resource_type}: {e}")
                 raise
     
+    async def _fetch_resource(
+        self,
+        resource_type: str,
+        name: str,
+        namespace: str,
+        resource_version: Optional[str]
+    ) -> Optional[Dict[str, Any]]:
+        if resource_version is None:
+            result = await self._call(self._resolve("read", resource_type), name=name, namespace=namespace)
+        else:
+            # read_namespaced_* take no resourceVersion; a name-selected list does
+            items = (await self._call(
+                self._resolve("list", resource_type),
+                namespace=namespace,
+                field_selector=f"metadata.name={name}",
+                resource_version=resource_version
+            )).items
+            if not items:
+                return None
+            result = items[0]
+        return get_projection(resource_type)(result)
+    
+    async def _fetch_list(
+        self,
+        resource_type: str,
+        namespace: Optional[str],
+        resource_version: Optional[str]
+    ) -> List[Dict[str, Any]]:
+        return [
+            item async for item in self._iter_pages(resource_type, namespace, resource_version, _LIST_PAGE_SIZE)
+        ]
+    
+    async def iter_resources(
+        self,
+        resource_type: str,
+        namespace: str = "default",
+        all_namespaces: bool = False,
+        page_size: int = _LIST_PAGE_SIZE
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield projected resources a page at a time, holding only one page in memory"""
+        if not self.v1:
+            raise Exception("Kubernetes client not initialized")
+        async for item in self._iter_pages(resource_type, None if all_namespaces else namespace, None, page_size):
+            yield item
+    
+    async def _iter_pages(
+        self,
+        resource_type: str,
+        namespace: Optional[str],
+        resource_version: Optional[str],
+        page_size: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        if namespace is None:
+            list_fn, kwargs = self._resolve("list_all", resource_type), {}
+        else:
+            list_fn, kwargs = self._resolve("list", resource_type), {"namespace": namespace}
+        if resource_version is not None:
+            kwargs["resource_version"] = resource_version
+        
+        project = get_projection(resource_type)
+        while True:
+            page = await self._call(list_fn, limit=page_size, **kwargs)
+            for item in page.items:
+                yield project(item)
+            continue_token = page.metadata._continue
+            if not continue_token:
+                break
+            # Later pages are pinned by the continue token, which can't be combined with resourceVersion
+            kwargs.pop("resource_version", None)
+            kwargs["_continue"] = continue_token
+    
+    async def scale_deployment(
+        self,
+        name: str,
+        namespace: str = "default",
+        replicas: int = 1
+    ) -> Dict[str, Any]:
+        """Scale a deployment with a single patch to its scale subresource"""
+        with tracer.start_as_current_span("k8s_scale_deployment", attributes={
+            "name": name,
+            "namespace": namespace,
+            "replicas": replicas
+        }) as span:
+            try:
+                if not self.apps_v1:
+                    raise Exception("Kubernetes client not initialized")
+                
+                await self._call(
+                    self.apps_v1.patch_namespaced_deployment_scale,
+                    name=name,
+                    namespace=namespace,
+                    body={"spec": {"replicas": replicas}}
+                )
+                
+                span.set_status("OK")
+                return {"status": "scaled", "name": name, "replicas": replicas}
+                
+            except Exception as e:
+                span.set_status("ERROR", str(e))
+                self.logger.error(f"Failed to scale deployment {name}: {e}")
+                raise
+    
     async def delete_resource(
         self, 
         resource_type: str, 
@@ -182,29 +491,17 @@ class KubernetesClient:
         namespace: str = "default"
     ) -> Dict[str, Any]:
         """Delete a Kubernetes resource"""
-        with tracer.start_as_current_span("k8s_delete_resource") as span:
-            span.set_attribute("resource_type", resource_type)
-            span.set_attribute("name", name)
-            span.set_attribute("namespace", namespace)
-            
+        with tracer.start_as_current_span("k8s_delete_resource", attributes={
+            "resource_type": resource_type,
+            "name": name,
+            "namespace": namespace
+        }) as span:
             try:
                 if not self.v1:
                     raise Exception("Kubernetes client not initialized")
                 
-                if resource_type.lower() == "deployment":
-                    self.apps_v1.delete_namespaced_deployment(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type.lower() == "service":
-                    self.v1.delete_namespaced_service(
-                        name=name, namespace=namespace
-                    )
-                elif resource_type.lower() == "pod":
-                    self.v1.delete_namespaced_pod(
-                        name=name, namespace=namespace
-                    )
-                else:
-                    raise ValueError(f"Unsupported resource type: {resource_type}")
+                delete = self._resolve("delete", resource_type)
+                await self._call(delete, name=name, namespace=namespace)
                 
                 span.set_status("OK")
                 return {"status": "deleted", "name": name}
@@ -0,0 +1,60 @@
+"""
+Process-wide cache of loaded Kubernetes client configuration
+
+Loading a kubeconfig parses YAML and may run exec credential plugins, so
+it is done once per file and repeated only when the file changes.
+"""
+
+import copy
+import os
+import threading
+from typing import Dict, Optional, Tuple
+
+from kubernetes import client, config
+from kubernetes.config.incluster_config import SERVICE_TOKEN_FILENAME
+from kubernetes.config.kube_config import KUBE_CONFIG_DEFAULT_LOCATION
+
+# kubeconfig path (None for in-cluster/default discovery) -> (source mtime, configuration)
+_CONFIG_CACHE: Dict[Optional[str], Tuple[float, client.Configuration]] = {}
+_CONFIG_LOCK = threading.Lock()
+
+
+def _mtime(path: str) -> float:
+    try:
+        return os.stat(os.path.expanduser(path)).st_mtime
+    except OSError:
+        return 0.0
+
+
+def _load(kubeconfig_path: Optional[str]) -> client.Configuration:
+    configuration = client.Configuration()
+    if kubeconfig_path:
+        config.load_kube_config(config_file=kubeconfig_path, client_configuration=configuration)
+    else:
+        # Try in-cluster config first, then local config
+        try:
+            config.load_incluster_config(client_configuration=configuration)
+        except config.ConfigException:
+            config.load_kube_config(client_configuration=configuration)
+    return configuration
+
+
+def load_configuration(kubeconfig_path: Optional[str] = None) -> client.Configuration:
+    """
+    Get a private copy of the cluster configuration, loading it only if
+    the kubeconfig (or service account token) changed since the last load
+    """
+    source = kubeconfig_path or (
+        SERVICE_TOKEN_FILENAME if os.path.exists(SERVICE_TOKEN_FILENAME)
+        else os.environ.get("KUBECONFIG", KUBE_CONFIG_DEFAULT_LOCATION).split(os.pathsep)[0]
+    )
+    mtime = _mtime(source)
+
+    with _CONFIG_LOCK:
+        cached = _CONFIG_CACHE.get(kubeconfig_path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, _load(kubeconfig_path))
+            _CONFIG_CACHE[kubeconfig_path] = cached
+
+    # Callers adjust pool sizes etc., so hand out copies
+    return copy.deepcopy(cached[1])
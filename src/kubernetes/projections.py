@@ -0,0 +1,58 @@
+"""
+Lightweight projections of Kubernetes API objects
+
+Building a full dict with to_dict() walks every field of the generated
+model. These read only the fields AutoOps consumes.
+"""
+
+from typing import Any, Callable, Dict
+
+
+def _project_metadata(obj) -> Dict[str, Any]:
+    metadata = obj.metadata
+    return {"name": metadata.name, "namespace": metadata.namespace}
+
+
+def _project_pod(pod) -> Dict[str, Any]:
+    status = pod.status
+    return {
+        "name": pod.metadata.name,
+        "namespace": pod.metadata.namespace,
+        "phase": status.phase if status else None,
+        "pod_ip": status.pod_ip if status else None,
+        "node_name": pod.spec.node_name if pod.spec else None,
+    }
+
+
+def _project_deployment(deployment) -> Dict[str, Any]:
+    status = deployment.status
+    return {
+        "name": deployment.metadata.name,
+        "namespace": deployment.metadata.namespace,
+        "replicas": deployment.spec.replicas if deployment.spec else None,
+        "ready_replicas": status.ready_replicas if status else None,
+        "available_replicas": status.available_replicas if status else None,
+    }
+
+
+def _project_service(service) -> Dict[str, Any]:
+    spec = service.spec
+    return {
+        "name": service.metadata.name,
+        "namespace": service.metadata.namespace,
+        "type": spec.type if spec else None,
+        "cluster_ip": spec.cluster_ip if spec else None,
+    }
+
+
+# resource_type -> projection; other types fall back to name and namespace
+_PROJECTIONS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    "pod": _project_pod,
+    "deployment": _project_deployment,
+    "service": _project_service,
+}
+
+
+def get_projection(resource_type: str) -> Callable[[Any], Dict[str, Any]]:
+    """Projection function for a resource type"""
+    return _PROJECTIONS.get(resource_type.lower(), _project_metadata)
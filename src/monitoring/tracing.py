@@ -2,24 +2,82 @@
 OpenTelemetry tracing configuration for AutoOps
 """
 
+import functools
 import os
-from typing import Optional
+from typing import List, Optional, Sequence
 
 from opentelemetry import trace
-from opentelemetry.exporter.jaeger.thrift import JaegerExporter
-from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
-from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-from opentelemetry.instrumentation.requests import RequestsInstrumentor
-from opentelemetry.instrumentation.logging import LoggingInstrumentor
 from opentelemetry.sdk.resources import Resource
-from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import BatchSpanProcessor
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, SpanExporter, SpanExportResult
+from opentelemetry.sdk.trace.sampling import ALWAYS_ON, ParentBased, TraceIdRatioBased
+from opentelemetry.trace import StatusCode
 
-from config.settings import settings
+from config.settings import get_settings
+
+
+class ErrorBiasedSpanProcessor(SpanProcessor):
+    """
+    Tail sampling: export every span that ended in error, and otherwise
+    only spans whose trace ID falls within the sampling ratio (so kept
+    traces stay complete).
+    """
+    
+    def __init__(self, delegate: SpanProcessor, ratio: float):
+        self._delegate = delegate
+        self._bound = round(ratio * (1 << 64))
+    
+    def on_start(self, span, parent_context=None):
+        self._delegate.on_start(span, parent_context=parent_context)
+    
+    def on_end(self, span: ReadableSpan):
+        if (
+            span.status.status_code is StatusCode.ERROR
+            or (span.context.trace_id & 0xFFFFFFFFFFFFFFFF) < self._bound
+        ):
+            self._delegate.on_end(span)
+    
+    def shutdown(self):
+        self._delegate.shutdown()
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return self._delegate.force_flush(timeout_millis)
+
+
+class FanOutSpanExporter(SpanExporter):
+    """Hands each exported batch to several exporters, so one processor queue serves them all"""
+    
+    def __init__(self, exporters: List[SpanExporter]):
+        self._exporters = exporters
+    
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        result = SpanExportResult.SUCCESS
+        for exporter in self._exporters:
+            if exporter.export(spans) is not SpanExportResult.SUCCESS:
+                result = SpanExportResult.FAILURE
+        return result
+    
+    def shutdown(self):
+        for exporter in self._exporters:
+            exporter.shutdown()
+    
+    def force_flush(self, timeout_millis: int = 30000) -> bool:
+        return all(exporter.force_flush(timeout_millis) for exporter in self._exporters)
+
+
+def _batch_processor(exporter) -> BatchSpanProcessor:
+    """Batch processor with queue and batch sizes suited to high span volume"""
+    return BatchSpanProcessor(
+        exporter,
+        max_queue_size=2048,
+        max_export_batch_size=512,
+        schedule_delay_millis=5000
+    )
 
 
 def setup_tracing():
     """Initialize OpenTelemetry tracing"""
+    settings = get_settings()
     
     # Create resource
     resource = Resource.create({
@@ -27,36 +85,55 @@ def setup_tracing():
         "service.version": "1.0.0",
     })
     
+    if settings.otel_tail_sampling:
+        # Record everything; ErrorBiasedSpanProcessor decides what to export
+        sampler = ALWAYS_ON
+    else:
+        # Head-based sampling: root spans are sampled by trace ID, children follow their parent
+        sampler = ParentBased(root=TraceIdRatioBased(settings.otel_sampling_ratio))
+    
     # Set tracer provider
-    tracer_provider = TracerProvider(resource=resource)
+    tracer_provider = TracerProvider(resource=resource, sampler=sampler)
     trace.set_tracer_provider(tracer_provider)
     
     # Configure exporters
+    exporters: List[SpanExporter] = []
+    # Exporters and instrumentors pull in grpc/thrift and patch libraries; import only what is enabled
     if settings.otel_exporter_otlp_endpoint:
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
         otlp_exporter = OTLPSpanExporter(
             endpoint=settings.otel_exporter_otlp_endpoint,
             insecure=True
         )
-        tracer_provider.add_span_processor(
-            BatchSpanProcessor(otlp_exporter)
-        )
+        exporters.append(otlp_exporter)
     
     if settings.otel_exporter_jaeger_endpoint:
+        from opentelemetry.exporter.jaeger.thrift import JaegerExporter
         jaeger_exporter = JaegerExporter(
             agent_host_name="localhost",
             agent_port=6831,
         )
-        tracer_provider.add_span_processor(
-            BatchSpanProcessor(jaeger_exporter)
-        )
+        exporters.append(jaeger_exporter)
+    
+    # One batch queue and worker thread, whatever the number of exporters
+    if exporters:
+        processor = _batch_processor(exporters[0] if len(exporters) == 1 else FanOutSpanExporter(exporters))
+        if settings.otel_tail_sampling:
+            processor = ErrorBiasedSpanProcessor(processor, settings.otel_sampling_ratio)
+        tracer_provider.add_span_processor(processor)
     
-    # Auto-instrument libraries
-    RequestsInstrumentor().instrument()
-    LoggingInstrumentor().instrument()
+    # Auto-instrumentation patches every outgoing request / log record, so it is opt-in
+    if settings.otel_instrument_requests:
+        from opentelemetry.instrumentation.requests import RequestsInstrumentor
+        RequestsInstrumentor().instrument()
+    if settings.otel_instrument_logging:
+        from opentelemetry.instrumentation.logging import LoggingInstrumentor
+        LoggingInstrumentor().instrument(set_logging_format=False)
     
     return tracer_provider
 
 
+@functools.lru_cache(maxsize=None)
 def get_tracer(name: str) -> trace.Tracer:
     """Get a tracer instance"""
     return trace.get_tracer(name)
@@ -64,6 +141,7 @@ def get_tracer(name: str) -> trace.Tracer:
 
 def instrument_fastapi(app):
     """Instrument FastAPI application"""
+    from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
     FastAPIInstrumentor.instrument_app(app)
 
 
@@ -4,7 +4,7 @@ Provides basic tracing capabilities with fallback options.
 """
 import logging
 from typing import Optional, Dict, Any
-from functools import wraps
+from functools import lru_cache, wraps
 
 logger = logging.getLogger(__name__)
 
@@ -13,21 +13,29 @@ class SimpleTracer:
     def __init__(self, name: str):
         self.name = name
         self.logger = logging.getLogger(f"tracer.{name}")
+        self._null_span = _NullSpan(self.logger)
     
     def start_span(self, name: str, **kwargs):
+        # Spans only produce log records; skip them entirely when nothing would be logged
+        if not self.logger.isEnabledFor(logging.INFO):
+            return self._null_span
         return SimpleSpan(name, self.logger, **kwargs)
     
     def start_as_current_span(self, name: str, **kwargs):
-        return SimpleSpan(name, self.logger, **kwargs)
+        return self.start_span(name, **kwargs)
 
 class SimpleSpan:
-    def __init__(self, name: str, logger: logging.Logger, **kwargs):
+    def __init__(self, name: str, logger: logging.Logger, attributes: Optional[Dict[str, Any]] = None, **kwargs):
         self.name = name
         self.logger = logger
         self.attributes = kwargs
+        if attributes:
+            self.attributes.update(attributes)
         
     def __enter__(self):
         self.logger.info(f"Starting span: {self.name}")
+        if self.attributes and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Span {self.name} attributes: {self.attributes}")
         return self
         
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -38,11 +46,59 @@ class SimpleSpan:
     
     def set_attribute(self, key: str, value: Any):
         self.attributes[key] = value
-        self.logger.debug(f"Span {self.name} attribute: {key}={value}")
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Span {self.name} attribute: {key}={value}")
+    
+    def set_attributes(self, attributes: Dict[str, Any]):
+        self.attributes.update(attributes)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Span {self.name} attributes: {attributes}")
+    
+    def is_recording(self) -> bool:
+        """Attributes are only emitted at DEBUG, so skip them otherwise"""
+        return self.logger.isEnabledFor(logging.DEBUG)
     
     def set_status(self, status: str, description: str = ""):
         self.logger.info(f"Span {self.name} status: {status} - {description}")
+    
+    def record_exception(self, exception: BaseException):
+        self.logger.error(f"Span {self.name} exception: {exception!r}")
+    
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.logger.debug(f"Span {self.name} event: {name} {attributes or {}}")
 
+class _NullSpan:
+    """Span used while tracer INFO logging is disabled; only failures are still logged"""
+    
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type:
+            self.logger.error(f"Span failed: {exc_val}")
+    
+    def set_attribute(self, key: str, value: Any):
+        pass
+    
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+    
+    def is_recording(self) -> bool:
+        return False
+    
+    def set_status(self, status: str, description: str = ""):
+        pass
+    
+    def record_exception(self, exception: BaseException):
+        self.logger.error(f"Span exception: {exception!r}")
+    
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        pass
+
+@lru_cache(maxsize=None)
 def get_tracer(name: str) -> SimpleTracer:
     """Get a tracer instance with the given name."""
     return SimpleTracer(name)
@@ -50,11 +106,11 @@ def get_tracer(name: str) -> SimpleTracer:
 def trace_function(span_name: Optional[str] = None):
     """Decorator to trace function calls."""
     def decorator(func):
+        tracer = get_tracer(func.__module__)
+        name = span_name or f"{func.__name__}"
+        
         @wraps(func)
         def wrapper(*args, **kwargs):
-            tracer = get_tracer(func.__module__)
-            name = span_name or f"{func.__name__}"
-            
             with tracer.start_span(name) as span:
                 try:
                     result = func(*args, **kwargs)
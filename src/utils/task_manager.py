@@ -3,22 +3,86 @@ Task Manager - Asynchronous task orchestration with robust error handling
 """
 
 import asyncio
-import json
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any, Callable
+import itertools
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Callable, Union
 from uuid import UUID, uuid4
 from enum import Enum
+import orjson
 import redis.asyncio as redis
 
-from opentelemetry import trace
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from ..monitoring.tracing_simple import get_tracer
 from ..agents.state import TaskStatus, AutoOpsState
-from config.settings import settings
+from config.settings import get_settings
 
 tracer = get_tracer(__name__)
 
+# Redis SET of all persisted task ids, so listing never scans the keyspace
+_TASK_INDEX_KEY = "autoops:tasks:index"
+# Redis HASH of status -> number of persisted tasks in that status
+_TASK_COUNTERS_KEY = "autoops:counters"
+# Redis HASH of task id -> stored status; counter transitions are applied against it
+_TASK_STATUS_KEY = "autoops:tasks:status"
+# Redis ZSETs of task ids scored by creation time: all tasks, and one per status
+_TASKS_BY_CREATED_KEY = "autoops:tasks:by_created"
+
+
+# Redis ZSETs of finished task ids scored by completion time, one per terminal status
+_TASKS_COMPLETED_AT_KEY = "autoops:tasks:completed_at"
+
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+_TERMINAL_STATUS_LIST = "," + ",".join(status.value for status in _TERMINAL_STATUSES) + ","
+
+# Writes a task and moves its counter and index entries from the status stored in
+# Redis (not the writer's idea of it), atomically, so several in-memory copies of
+# one task cannot count a transition twice. A terminal stored status is final:
+# later writes of another status are refused and 0 is returned.
+# KEYS: task key, status hash, counters hash, id index, by-created prefix, completed-at prefix
+# ARGV: task id, payload, status, created epoch, completed epoch or "", terminal status list
+_PERSIST_TASK_SCRIPT = """
+local old = redis.call('HGET', KEYS[2], ARGV[1])
+local new = ARGV[3]
+if old and old ~= new and string.find(ARGV[6], ',' .. old .. ',', 1, true) then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2])
+redis.call('SADD', KEYS[4], ARGV[1])
+if old ~= new then
+    redis.call('HSET', KEYS[2], ARGV[1], new)
+    redis.call('HINCRBY', KEYS[3], new, 1)
+    redis.call('ZADD', KEYS[5] .. ':' .. new, ARGV[4], ARGV[1])
+    if old then
+        redis.call('HINCRBY', KEYS[3], old, -1)
+        redis.call('ZREM', KEYS[5] .. ':' .. old, ARGV[1])
+    else
+        redis.call('ZADD', KEYS[5], ARGV[4], ARGV[1])
+    end
+    if ARGV[5] ~= '' then
+        redis.call('ZADD', KEYS[6] .. ':' .. new, ARGV[5], ARGV[1])
+    end
+end
+return 1
+"""
+
+# Seconds task writes are collected before being flushed in one pipeline
+_PERSIST_FLUSH_INTERVAL = 0.005
+
+# Task ids are UUID-formatted: the first group is a per-process counter (so short
+# ids like task_id[:8] still tell tasks apart), the rest comes from one uuid4 per
+# process, so no entropy is read per submission
+_TASK_ID_SUFFIX = str(uuid4())[8:]
+_task_id_counter = itertools.count()
+
+
+def _new_task_id() -> str:
+    return f"{next(_task_id_counter) & 0xFFFFFFFF:08x}{_TASK_ID_SUFFIX}"
+
+
+def _by_created_key(status: Optional[TaskStatus] = None) -> str:
+    return f"{_TASKS_BY_CREATED_KEY}:{status.value}" if status else _TASKS_BY_CREATED_KEY
+
 
 class TaskPriority(str, Enum):
     """Task priority levels"""
@@ -28,9 +92,55 @@ class TaskPriority(str, Enum):
     CRITICAL = "critical"
 
 
+# Queue rank per priority (lower runs first)
+_PRIORITY_RANK = {
+    TaskPriority.CRITICAL: 0,
+    TaskPriority.HIGH: 1,
+    TaskPriority.NORMAL: 2,
+    TaskPriority.LOW: 3,
+}
+
+# Queued ahead of every task to tell one worker to exit
+_SHUTDOWN_RANK = -1
+
+
+def _to_epoch(value: datetime) -> float:
+    """Epoch seconds for a naive UTC datetime"""
+    return value.replace(tzinfo=timezone.utc).timestamp()
+
+
+def _from_epoch(value: Union[float, str]) -> datetime:
+    """Naive UTC datetime from epoch seconds (or an ISO string written by older versions)"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.utcfromtimestamp(value)
+
+
+def _payload_field(name: str) -> property:
+    """Attribute that drops the task's cached payload whenever it is assigned"""
+    attr = f"_{name}"
+    
+    def getter(task):
+        return getattr(task, attr)
+    
+    def setter(task, value):
+        setattr(task, attr, value)
+        task._payload = None
+    
+    return property(getter, setter)
+
+
 class Task:
     """Task representation for async execution"""
     
+    # Serialized fields that change over a task's life invalidate the cached payload
+    status = _payload_field("status")
+    created_at = _payload_field("created_at")
+    started_at = _payload_field("started_at")
+    completed_at = _payload_field("completed_at")
+    error = _payload_field("error")
+    retry_count = _payload_field("retry_count")
+    
     def __init__(
         self,
         task_id: str,
@@ -43,7 +153,7 @@ class Task:
         self.request = request
         self.priority = priority
         self.status = TaskStatus.PENDING
-        self.timeout = timeout or settings.task_timeout_seconds
+        self.timeout = timeout or get_settings().task_timeout_seconds
         self.callback = callback
         self.created_at = datetime.utcnow()
         self.started_at: Optional[datetime] = None
@@ -51,6 +161,14 @@ class Task:
         self.result: Optional[AutoOpsState] = None
         self.error: Optional[str] = None
         self.retry_count = 0
+        self._payload: Optional[bytes] = None
+    
+    def to_bytes(self) -> bytes:
+        """Serialized task, rebuilt only after a field has changed"""
+        payload = self._payload
+        if payload is None:
+            payload = self._payload = orjson.dumps(self.to_dict())
+        return payload
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert task to dictionary"""
@@ -60,9 +178,9 @@ class Task:
             "priority": self.priority.value,
             "status": self.status.value,
             "timeout": self.timeout,
-            "created_at": self.created_at.isoformat(),
-            "started_at": self.started_at.isoformat() if self.started_at else None,
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "created_at": _to_epoch(self.created_at),
+            "started_at": _to_epoch(self.started_at) if self.started_at else None,
+            "completed_at": _to_epoch(self.completed_at) if self.completed_at else None,
             "error": self.error,
             "retry_count": self.retry_count
         }
@@ -77,9 +195,9 @@ class Task:
             timeout=data.get("timeout")
         )
         task.status = TaskStatus(data["status"])
-        task.created_at = datetime.fromisoformat(data["created_at"])
-        task.started_at = datetime.fromisoformat(data["started_at"]) if data.get("started_at") else None
-        task.completed_at = datetime.fromisoformat(data["completed_at"]) if data.get("completed_at") else None
+        task.created_at = _from_epoch(data["created_at"])
+        task.started_at = _from_epoch(data["started_at"]) if data.get("started_at") else None
+        task.completed_at = _from_epoch(data["completed_at"]) if data.get("completed_at") else None
         task.error = data.get("error")
         task.retry_count = data.get("retry_count", 0)
         return task
@@ -94,36 +212,57 @@ class TaskManager:
     def __init__(self):
         self.redis_client: Optional[redis.Redis] = None
         self.running_tasks: Dict[str, asyncio.Task] = {}
-        self.task_queue: asyncio.Queue = asyncio.Queue()
+        # Entries are (rank, sequence, task); the sequence keeps FIFO order within a
+        # priority so Task objects are never compared
+        self.task_queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._sequence = itertools.count()
         self.workers: List[asyncio.Task] = []
+        self._num_workers = 0
         self.is_running = False
+        self._waiters: Dict[str, asyncio.Future] = {}
+        # Tasks with unflushed changes (latest state wins) and the task flushing them
+        self._dirty: Dict[str, Task] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self.orchestrator = None
+        self._persist_script = None
         self._initialize_redis()
     
     def _initialize_redis(self):
         """Initialize Redis connection for state persistence"""
+        settings = get_settings()
         try:
             self.redis_client = redis.Redis(
                 host=settings.redis_host,
                 port=settings.redis_port,
                 db=settings.redis_db,
                 password=settings.redis_password,
-                decode_responses=True
+                # Payloads are orjson bytes; members and counters are decoded where read
+                decode_responses=False
             )
+            self._persist_script = self.redis_client.register_script(_PERSIST_TASK_SCRIPT)
         except Exception as e:
             # Fall back to in-memory storage if Redis is not available
             self.redis_client = None
     
-    async def start(self, num_workers: int = None):
-        """Start the task manager with worker processes"""
+    async def start(self, num_workers: Optional[int] = None):
+        """Start the task manager with worker processes (none if num_workers is 0)"""
         if self.is_running:
             return
         
-        num_workers = num_workers or settings.max_concurrent_tasks
+        from ..agents.orchestrator import AutoOpsOrchestrator
+        
+        if num_workers is None:
+            num_workers = get_settings().max_concurrent_tasks
         self.is_running = True
         
+        # One orchestrator (LLM client, compiled graph) shared by every worker
+        if self.orchestrator is None:
+            self.orchestrator = AutoOpsOrchestrator()
+        
         # Start worker tasks
+        self._num_workers = num_workers
         for i in range(num_workers):
-            worker = asyncio.create_task(self._worker(f"worker-{i}"))
+            worker = asyncio.create_task(self._worker(f"worker-{i}", self.orchestrator))
             self.workers.append(worker)
         
         # Start cleanup task
@@ -134,19 +273,38 @@ class TaskManager:
         """Stop the task manager gracefully"""
         self.is_running = False
         
-        # Cancel all workers
-        for worker in self.workers:
+        # Idle workers exit on their sentinel; busy ones exit once their task is cancelled
+        for _ in range(self._num_workers):
+            self.task_queue.put_nowait((_SHUTDOWN_RANK, next(self._sequence), None))
+        for task in self.running_tasks.values():
+            task.cancel()
+        # The cleanup task is the only other worker and just sleeps
+        for worker in self.workers[self._num_workers:]:
             worker.cancel()
         
         # Wait for workers to finish
         await asyncio.gather(*self.workers, return_exceptions=True)
         
-        # Cancel running tasks
-        for task in self.running_tasks.values():
-            task.cancel()
+        # Busy workers exit without taking their sentinel; drop the leftovers so they
+        # don't stop workers of a later start(). Queued tasks stay queued.
+        queued = []
+        while not self.task_queue.empty():
+            item = self.task_queue.get_nowait()
+            if item[2] is not None:
+                queued.append(item)
+        for item in queued:
+            self.task_queue.put_nowait(item)
         
         self.workers.clear()
+        self._num_workers = 0
         self.running_tasks.clear()
+        
+        # Let the flusher write out what is queued (cancelling it could drop a batch
+        # mid-write), then retry once for anything it left behind after an error
+        if self._flusher:
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        if self._dirty:
+            await self._flush()
     
     @tracer.start_as_current_span("task_manager_submit_task")
     async def submit_task(
@@ -158,7 +316,7 @@ class TaskManager:
         callback: Optional[Callable] = None
     ) -> str:
         """Submit a new task for execution"""
-        task_id = task_id or str(uuid4())
+        task_id = task_id or _new_task_id()
         
         task = Task(
             task_id=task_id,
@@ -171,15 +329,68 @@ class TaskManager:
         # Persist task state
         await self._persist_task(task)
         
-        # Add to queue with priority
-        await self.task_queue.put((priority.value, task))
+        # Add to queue with priority; the queue is unbounded, so this never waits
+        self.task_queue.put_nowait((_PRIORITY_RANK[priority], next(self._sequence), task))
         
         return task_id
     
     async def get_task_status(self, task_id: str) -> Optional[Dict[str, Any]]:
         """Get the status of a specific task"""
+        # Unflushed changes are the newest state
+        pending = self._dirty.get(task_id)
+        if pending is not None:
+            return pending.to_dict()
+        # Otherwise the stored payload already is the dict; no Task or datetimes are built
+        if self.redis_client:
+            try:
+                data = await self.redis_client.get(f"autoops:task:{task_id}")
+                if data:
+                    return orjson.loads(data)
+            except Exception:
+                pass
+        return None
+    
+    async def get_task_statuses(self, task_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the status of several tasks with a single Redis round-trip"""
+        # Unflushed changes are the newest state; only the rest are read from Redis
+        dirty = self._dirty
+        statuses = {task_id: dirty[task_id].to_dict() for task_id in task_ids if task_id in dirty}
+        stored_ids = [task_id for task_id in task_ids if task_id not in statuses]
+        if not stored_ids or not self.redis_client:
+            return statuses
+        try:
+            values = await self.redis_client.mget([f"autoops:task:{task_id}" for task_id in stored_ids])
+        except Exception:
+            return statuses
+        statuses.update(
+            (task_id, orjson.loads(data))
+            for task_id, data in zip(stored_ids, values)
+            if data
+        )
+        return statuses
+    
+    async def wait_for(self, task_id: str, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Wait until a task reaches a terminal status and return its final state"""
+        # Register before loading so a completion during the load isn't missed
+        waiter = self._waiters.get(task_id)
+        if waiter is None:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters[task_id] = waiter
+        
         task = await self._load_task(task_id)
-        return task.to_dict() if task else None
+        if task is None or task.status in _TERMINAL_STATUSES:
+            if self._waiters.get(task_id) is waiter and not waiter.done():
+                del self._waiters[task_id]
+            return task.to_dict() if task else None
+        
+        # Shield so one caller's timeout doesn't cancel the shared future
+        return await asyncio.wait_for(asyncio.shield(waiter), timeout)
+    
+    def _notify_waiters(self, task: Task):
+        """Resolve anyone waiting on the task's completion"""
+        waiter = self._waiters.pop(task.task_id, None)
+        if waiter and not waiter.done():
+            waiter.set_result(task.to_dict())
     
     async def cancel_task(self, task_id: str) -> bool:
         """Cancel a specific task"""
@@ -194,6 +405,7 @@ class TaskManager:
             task.status = TaskStatus.CANCELLED
             task.completed_at = datetime.utcnow()
             await self._persist_task(task)
+            self._notify_waiters(task)
             return True
         
         return False
@@ -203,32 +415,45 @@ class TaskManager:
         status: Optional[TaskStatus] = None,
         limit: int = 100
     ) -> List[Dict[str, Any]]:
-        """List tasks with optional filtering"""
-        tasks = await self._load_all_tasks()
-        
-        if status:
-            tasks = [t for t in tasks if t.status == status]
+        """List the newest tasks, optionally filtered by status"""
+        if not self.redis_client or limit <= 0:
+            return []
         
-        # Sort by created_at descending
-        tasks.sort(key=lambda t: t.created_at, reverse=True)
+        # Newest `limit` ids from the creation-time index, then their payloads in one MGET
+        index_key = _by_created_key(status)
+        try:
+            task_ids = [task_id.decode() for task_id in await self.redis_client.zrevrange(index_key, 0, limit - 1)]
+            if not task_ids:
+                return []
+            values = await self.redis_client.mget([f"autoops:task:{task_id}" for task_id in task_ids])
+        except Exception:
+            return []
         
-        return [t.to_dict() for t in tasks[:limit]]
+        tasks = []
+        expired = []
+        for task_id, data in zip(task_ids, values):
+            if data:
+                tasks.append(orjson.loads(data))
+            else:
+                expired.append(task_id)
+        if expired:
+            try:
+                await self.redis_client.zrem(index_key, *expired)
+            except Exception:
+                pass
+        return tasks
     
-    async def _worker(self, worker_name: str):
+    async def _worker(self, worker_name: str, orchestrator):
         """Worker process that executes tasks from the queue"""
-        from ..agents.orchestrator import AutoOpsOrchestrator
-        
-        orchestrator = AutoOpsOrchestrator()
-        
         with tracer.start_as_current_span(f"task_worker_{worker_name}"):
-            while self.is_running:
+            while True:
                 try:
-                    # Get task from queue with timeout
-                    try:
-                        priority, task = await asyncio.wait_for(
-                            self.task_queue.get(), timeout=1.0
-                        )
-                    except asyncio.TimeoutError:
+                    # Blocks without a timer; stop() wakes the worker with a sentinel
+                    _, _, task = await self.task_queue.get()
+                    if task is None:
+                        break
+                    # Cancelled (possibly through another copy of the task) while queued
+                    if await self._already_finished(task):
                         continue
                     
                     # Execute task
@@ -239,6 +464,10 @@ class TaskManager:
                     
                     try:
                         await execution_task
+                    except asyncio.CancelledError:
+                        # Only the task was cancelled (cancel_task); keep serving the queue
+                        if asyncio.current_task().cancelling() or not self.is_running:
+                            raise
                     finally:
                         if task.task_id in self.running_tasks:
                             del self.running_tasks[task.task_id]
@@ -249,54 +478,65 @@ class TaskManager:
                     # Log worker error but continue
                     pass
     
-    @tracer.start_as_current_span("task_execution")
+    async def _already_finished(self, task: Task) -> bool:
+        """Whether the task's latest stored state is terminal"""
+        latest = await self._load_task(task.task_id)
+        return (latest or task).status in _TERMINAL_STATUSES
+    
     async def _execute_task(self, task: Task, orchestrator):
         """Execute a single task with timeout and error handling"""
-        span = trace.get_current_span()
-        span.set_attribute("task_id", task.task_id)
-        span.set_attribute("task_priority", task.priority.value)
-        
-        task.status = TaskStatus.EXECUTING
-        task.started_at = datetime.utcnow()
-        await self._persist_task(task)
-        
-        try:
-            # Execute with timeout
-            result = await asyncio.wait_for(
-                orchestrator.process_request(task.request, task.task_id),
-                timeout=task.timeout
-            )
+        with tracer.start_as_current_span(
+            "task_execution",
+            attributes={"task_id": task.task_id, "task_priority": task.priority.value}
+        ) as span:
+            # Unsampled spans drop attributes anyway; skip building them
+            recording = span.is_recording()
             
-            task.result = result
-            task.status = TaskStatus.COMPLETED
-            task.completed_at = datetime.utcnow()
+            task.status = TaskStatus.EXECUTING
+            task.started_at = datetime.utcnow()
+            await self._persist_task(task)
             
-            span.set_attribute("task_success", True)
+            try:
+                # Execute with timeout
+                result = await asyncio.wait_for(
+                    orchestrator.process_request(task.request, task.task_id),
+                    timeout=task.timeout
+                )
             
-            # Execute callback if provided
-            if task.callback:
-                try:
-                    await task.callback(task, result)
-                except Exception as e:
-                    # Log callback error but don't fail the task
-                    span.add_event("callback_error", {"error": str(e)})
+                task.result = result
+                task.status = TaskStatus.COMPLETED
+                task.completed_at = datetime.utcnow()
             
-        except asyncio.TimeoutError:
-            task.status = TaskStatus.FAILED
-            task.error = f"Task timed out after {task.timeout} seconds"
-            task.completed_at = datetime.utcnow()
-            span.set_attribute("task_success", False)
-            span.set_attribute("timeout", True)
+                if recording:
+                    span.set_attribute("task_success", True)
             
-        except Exception as e:
-            task.status = TaskStatus.FAILED
-            task.error = str(e)
-            task.completed_at = datetime.utcnow()
-            span.record_exception(e)
-            span.set_attribute("task_success", False)
-        
-        finally:
-            await self._persist_task(task)
+                # Execute callback if provided
+                if task.callback:
+                    try:
+                        await task.callback(task, result)
+                    except Exception as e:
+                        # Log callback error but don't fail the task
+                        if recording:
+                            span.add_event("callback_error", {"error": str(e)})
+            
+            except asyncio.TimeoutError:
+                task.status = TaskStatus.FAILED
+                task.error = f"Task timed out after {task.timeout} seconds"
+                task.completed_at = datetime.utcnow()
+                if recording:
+                    span.set_attributes({"task_success": False, "timeout": True})
+            
+            except Exception as e:
+                task.status = TaskStatus.FAILED
+                task.error = str(e)
+                task.completed_at = datetime.utcnow()
+                if recording:
+                    span.record_exception(e)
+                    span.set_attribute("task_success", False)
+            
+            finally:
+                await self._persist_task(task)
+                self._notify_waiters(task)
     
     async def _cleanup_completed_tasks(self):
         """Cleanup completed tasks periodically"""
@@ -304,13 +544,17 @@ class TaskManager:
             try:
                 await asyncio.sleep(300)  # Run every 5 minutes
                 
-                cutoff_time = datetime.utcnow() - timedelta(hours=24)
-                tasks = await self._load_all_tasks()
+                if not self.redis_client:
+                    continue
+                cutoff = _to_epoch(datetime.utcnow() - timedelta(hours=24))
                 
-                for task in tasks:
-                    if (task.status in [TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED] 
-                        and task.completed_at and task.completed_at < cutoff_time):
-                        await self._delete_task(task.task_id)
+                # Expired ids come straight from the completion-time index; no payloads are read
+                for status in _TERMINAL_STATUSES:
+                    task_ids = await self.redis_client.zrangebyscore(
+                        f"{_TASKS_COMPLETED_AT_KEY}:{status.value}", 0, cutoff
+                    )
+                    if task_ids:
+                        await self._delete_tasks([task_id.decode() for task_id in task_ids], status)
                 
             except asyncio.CancelledError:
                 break
@@ -319,62 +563,140 @@ class TaskManager:
                 pass
     
     async def _persist_task(self, task: Task):
-        """Persist task state to Redis or memory"""
+        """
+        Queue the task's state for persistence
+        
+        Writes from all callers are collected for a few milliseconds and sent
+        in one pipeline; a task changed several times in that window is
+        written once, in its latest state.
+        """
         if self.redis_client:
-            try:
-                await self.redis_client.set(
-                    f"autoops:task:{task.task_id}",
-                    json.dumps(task.to_dict()),
-                    ex=86400  # 24 hour expiry
-                )
-            except Exception:
-                # Fall back to in-memory storage
-                pass
+            queued = self._dirty.get(task.task_id)
+            # A terminal state is final, even if another copy of the task still runs
+            if (
+                queued is not None
+                and queued.status in _TERMINAL_STATUSES
+                and task.status not in _TERMINAL_STATUSES
+            ):
+                return
+            self._dirty[task.task_id] = task
+            if self._flusher is None:
+                self._flusher = asyncio.create_task(self._flush_loop())
+    
+    async def _flush_loop(self):
+        try:
+            while self._dirty:
+                await asyncio.sleep(_PERSIST_FLUSH_INTERVAL)
+                if not await self._flush():
+                    # Redis is unavailable; the batch stays queued for the next write or stop()
+                    break
+        finally:
+            self._flusher = None
+    
+    def _requeue(self, batch: Dict[str, Task]):
+        """Put an unwritten batch back, keeping any newer state queued since"""
+        for task_id, task in batch.items():
+            self._dirty.setdefault(task_id, task)
+    
+    async def _flush(self) -> bool:
+        """Write all queued task states in one pipeline; False if the write failed"""
+        batch, self._dirty = self._dirty, {}
+        if not batch:
+            return True
+        try:
+            # No TTL: the cleanup task deletes finished tasks and keeps the counters in step
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for task in batch.values():
+                    completed_at = ""
+                    if task.status in _TERMINAL_STATUSES and task.completed_at:
+                        completed_at = _to_epoch(task.completed_at)
+                    await self._persist_script(
+                        keys=[
+                            f"autoops:task:{task.task_id}",
+                            _TASK_STATUS_KEY,
+                            _TASK_COUNTERS_KEY,
+                            _TASK_INDEX_KEY,
+                            _TASKS_BY_CREATED_KEY,
+                            _TASKS_COMPLETED_AT_KEY,
+                        ],
+                        args=[
+                            task.task_id,
+                            task.to_bytes(),
+                            task.status.value,
+                            _to_epoch(task.created_at),
+                            completed_at,
+                            _TERMINAL_STATUS_LIST,
+                        ],
+                        client=pipe
+                    )
+                await pipe.execute()
+        except asyncio.CancelledError:
+            self._requeue(batch)
+            raise
+        except Exception:
+            # Fall back to in-memory storage until a later flush succeeds
+            self._requeue(batch)
+            return False
+        return True
     
     async def _load_task(self, task_id: str) -> Optional[Task]:
         """Load task from Redis or memory"""
+        # Changes not yet flushed are the newest state
+        pending = self._dirty.get(task_id)
+        if pending is not None:
+            return pending
         if self.redis_client:
             try:
                 data = await self.redis_client.get(f"autoops:task:{task_id}")
                 if data:
-                    return Task.from_dict(json.loads(data))
+                    return Task.from_dict(orjson.loads(data))
             except Exception:
                 pass
         return None
     
-    async def _load_all_tasks(self) -> List[Task]:
-        """Load all tasks from storage"""
-        tasks = []
+    async def _delete_tasks(self, task_ids: List[str], status: Optional[TaskStatus] = None):
+        """Delete tasks (all in `status`, if given) from storage in one pipeline"""
+        for task_id in task_ids:
+            self._dirty.pop(task_id, None)
         if self.redis_client:
             try:
-                keys = await self.redis_client.keys("autoops:task:*")
-                for key in keys:
-                    data = await self.redis_client.get(key)
-                    if data:
-                        tasks.append(Task.from_dict(json.loads(data)))
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.delete(*(f"autoops:task:{task_id}" for task_id in task_ids))
+                    pipe.srem(_TASK_INDEX_KEY, *task_ids)
+                    pipe.hdel(_TASK_STATUS_KEY, *task_ids)
+                    pipe.zrem(_TASKS_BY_CREATED_KEY, *task_ids)
+                    if status is not None:
+                        pipe.hincrby(_TASK_COUNTERS_KEY, status.value, -len(task_ids))
+                        pipe.zrem(_by_created_key(status), *task_ids)
+                        if status in _TERMINAL_STATUSES:
+                            pipe.zrem(f"{_TASKS_COMPLETED_AT_KEY}:{status.value}", *task_ids)
+                    await pipe.execute()
             except Exception:
                 pass
-        return tasks
     
-    async def _delete_task(self, task_id: str):
-        """Delete task from storage"""
+    async def get_metrics(self) -> Dict[str, Any]:
+        """Get task manager metrics"""
+        # One HGETALL of the status counters instead of loading every task
+        counts: Dict[str, int] = {}
         if self.redis_client:
             try:
-                await self.redis_client.delete(f"autoops:task:{task_id}")
+                counts = {
+                    status.decode(): int(value)
+                    for status, value in (await self.redis_client.hgetall(_TASK_COUNTERS_KEY)).items()
+                }
             except Exception:
                 pass
-    
-    async def get_metrics(self) -> Dict[str, Any]:
-        """Get task manager metrics"""
-        tasks = await self._load_all_tasks()
+        
+        def count(status: TaskStatus) -> int:
+            return counts.get(status.value, 0)
         
         metrics = {
-            "total_tasks": len(tasks),
-            "pending_tasks": len([t for t in tasks if t.status == TaskStatus.PENDING]),
-            "executing_tasks": len([t for t in tasks if t.status == TaskStatus.EXECUTING]),
-            "completed_tasks": len([t for t in tasks if t.status == TaskStatus.COMPLETED]),
-            "failed_tasks": len([t for t in tasks if t.status == TaskStatus.FAILED]),
-            "cancelled_tasks": len([t for t in tasks if t.status == TaskStatus.CANCELLED]),
+            "total_tasks": sum(count(status) for status in TaskStatus),
+            "pending_tasks": count(TaskStatus.PENDING),
+            "executing_tasks": count(TaskStatus.EXECUTING),
+            "completed_tasks": count(TaskStatus.COMPLETED),
+            "failed_tasks": count(TaskStatus.FAILED),
+            "cancelled_tasks": count(TaskStatus.CANCELLED),
             "running_workers": len(self.workers),
             "active_tasks": len(self.running_tasks),
             "queue_size": self.task_queue.qsize()
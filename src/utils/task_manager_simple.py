@@ -3,8 +3,10 @@ Simplified Task Manager for AutoOps
 """
 
 import asyncio
+import itertools
 import logging
 import time
+from collections import Counter
 from enum import Enum
 from typing import Any, Dict, Optional, Callable, List
 from uuid import uuid4, UUID
@@ -32,9 +34,50 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
+_TERMINAL_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.FAILED, TaskStatus.CANCELLED})
+
+# Queue rank per priority (lower runs first)
+_PRIORITY_RANK = {
+    TaskPriority.CRITICAL: 0,
+    TaskPriority.HIGH: 1,
+    TaskPriority.NORMAL: 2,
+    TaskPriority.LOW: 3,
+}
+
+# Task ids are UUID-formatted: the first group is a per-process counter (so short
+# ids like task_id[:8] still tell tasks apart), the rest comes from one uuid4 per
+# process, so no entropy is read per submission
+_TASK_ID_SUFFIX = str(uuid4())[8:]
+_task_id_counter = itertools.count()
+
+
+def _new_task_id() -> str:
+    return f"{next(_task_id_counter) & 0xFFFFFFFF:08x}{_TASK_ID_SUFFIX}"
+
+
+def _info_field(name: str) -> property:
+    """Attribute that drops the task's cached info dict whenever it is assigned"""
+    attr = f"_{name}"
+    
+    def getter(task):
+        return getattr(task, attr)
+    
+    def setter(task, value):
+        setattr(task, attr, value)
+        task._info = None
+    
+    return property(getter, setter)
+
+
 class Task:
     """Simple task representation"""
     
+    # Fields that change over a task's life invalidate the cached info dict
+    status = _info_field("status")
+    started_at = _info_field("started_at")
+    completed_at = _info_field("completed_at")
+    error = _info_field("error")
+    
     def __init__(
         self,
         task_id: str,
@@ -47,6 +90,8 @@ class Task:
     ):
         self.task_id = task_id
         self.func = func
+        # Resolved once instead of on every execution
+        self.is_coroutine = asyncio.iscoroutinefunction(func)
         self.args = args
         self.kwargs = kwargs or {}
         self.priority = priority
@@ -58,33 +103,114 @@ class Task:
         self.created_at = time.time()
         self.started_at = None
         self.completed_at = None
+        self._info: Optional[Dict[str, Any]] = None
 
 
 class SimpleTaskManager:
     """Simplified task manager for AutoOps"""
     
-    def __init__(self, max_concurrent_tasks: int = 10):
+    def __init__(self, max_concurrent_tasks: int = 10, max_tasks: int = 10_000, max_queued: int = 10_000):
         self.max_concurrent_tasks = max_concurrent_tasks
+        # Insertion-ordered; beyond max_tasks the oldest finished tasks are dropped
         self.tasks: Dict[str, Task] = {}
+        self.max_tasks = max_tasks
+        # Task id -> worker currently executing it
         self.running_tasks: Dict[str, asyncio.Task] = {}
-        self.semaphore = asyncio.Semaphore(max_concurrent_tasks)
+        # (rank, sequence, task) consumed by max_concurrent_tasks long-lived workers;
+        # submit_task waits once max_queued tasks are queued
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue(maxsize=max_queued)
+        self._sequence = itertools.count()
+        self._workers: List[asyncio.Task] = []
+        self._waiters: Dict[str, asyncio.Future] = {}
         self._started = False
+        # Wall-clock start for display; uptime is measured on the monotonic clock
         self.start_time = time.time()
+        self._mono_start = time.monotonic()
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+        # Tasks per status, kept current by _set_status so metrics never scan tasks
+        self._status_counts: Counter = Counter()
+    
+    def add_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Call listener(task_info) whenever a task is submitted or changes status"""
+        self._listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[Dict[str, Any]], None]):
+        """Stop calling a listener added with add_listener"""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _set_status(self, task: Task, status: TaskStatus):
+        self._status_counts[task.status] -= 1
+        task.status = status
+        self._status_counts[status] += 1
+    
+    def _evict_finished(self):
+        """Drop the oldest finished tasks while over max_tasks (unfinished tasks are kept)"""
+        excess = len(self.tasks) - self.max_tasks
+        if excess <= 0:
+            return
+        evicted = []
+        for task_id, task in self.tasks.items():
+            if task.status in _TERMINAL_STATUSES:
+                evicted.append(task)
+                if len(evicted) == excess:
+                    break
+        for task in evicted:
+            del self.tasks[task.task_id]
+            self._status_counts[task.status] -= 1
+    
+    def _notify(self, task: Task):
+        if not self._listeners:
+            return
+        info = self._task_info(task)
+        for listener in self._listeners:
+            try:
+                listener(info)
+            except Exception as e:
+                logger.error(f"Task listener failed: {e}")
+    
+    def _notify_waiters(self, task: Task):
+        waiter = self._waiters.pop(task.task_id, None)
+        if waiter and not waiter.done():
+            waiter.set_result(None)
     
     async def start(self):
         """Start the task manager"""
+        if self._started:
+            return
         self._started = True
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_concurrent_tasks)
+        ]
         logger.info("Task manager started")
     
     async def stop(self):
         """Stop the task manager"""
-        # Cancel all running tasks
-        for task_id, asyncio_task in self.running_tasks.items():
-            asyncio_task.cancel()
+        self._started = False
+        # Cancelling the workers also cancels the tasks they are running
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
         
+        self._workers.clear()
         self.running_tasks.clear()
-        self._started = False
         logger.info("Task manager stopped")
+    
+    async def _worker(self):
+        """Run queued tasks one at a time until stopped"""
+        while True:
+            _, _, task = await self._queue.get()
+            if task.status is TaskStatus.CANCELLED:
+                # Cancelled while still queued
+                continue
+            try:
+                await self._execute_task(task)
+            except asyncio.CancelledError:
+                if task.status is not TaskStatus.CANCELLED:
+                    # The manager is stopping
+                    raise
+                # Only this task was cancelled; keep serving the queue
+                asyncio.current_task().uncancel()
         
     async def submit_task(
         self,
@@ -100,7 +226,7 @@ class SimpleTaskManager:
         """Submit a task for execution"""
         with tracer.start_as_current_span("task_manager_submit_task") as span:
             if task_id is None:
-                task_id = str(uuid4())
+                task_id = _new_task_id()
             
             # If request is provided (from dashboard), create a simple processing function
             if request and func is None:
@@ -118,12 +244,17 @@ class SimpleTaskManager:
             )
             
             self.tasks[task_id] = task
+            self._status_counts[task.status] += 1
+            self._evict_finished()
+            self._notify(task)
             
-            # Start execution
-            asyncio_task = asyncio.create_task(self._execute_task(task))
-            self.running_tasks[task_id] = asyncio_task
+            # Queue for the worker pool
+            if not self._started:
+                await self.start()
+            await self._queue.put((_PRIORITY_RANK[task.priority], next(self._sequence), task))
             
-            span.set_attribute("task_id", task_id)
+            if span.is_recording():
+                span.set_attribute("task_id", task_id)
             span.set_status("OK")
             
             return task_id
@@ -135,44 +266,69 @@ class SimpleTaskManager:
         return f"Processed request: {request}"
     
     async def _execute_task(self, task: Task):
-        """Execute a single task"""
-        async with self.semaphore:
-            with tracer.start_as_current_span("task_execution") as span:
-                span.set_attribute("task_id", task.task_id)
+        """Execute a single task on the calling worker"""
+        self.running_tasks[task.task_id] = asyncio.current_task()
+        with tracer.start_as_current_span(
+            "task_execution",
+            attributes={"task_id": task.task_id, "task_priority": task.priority.value}
+        ) as span:
+            
+            try:
+                self._set_status(task, TaskStatus.RUNNING)
+                task.started_at = time.time()
+                self._notify(task)
                 
-                try:
-                    task.status = TaskStatus.RUNNING
-                    task.started_at = time.time()
-                    
-                    if asyncio.iscoroutinefunction(task.func):
-                        result = await task.func(*task.args, **task.kwargs)
-                    else:
-                        result = task.func(*task.args, **task.kwargs)
-                    
-                    task.result = result
-                    task.status = TaskStatus.COMPLETED
-                    task.completed_at = time.time()
-                    
-                    span.set_status("OK")
-                    
-                except Exception as e:
-                    task.error = str(e)
-                    task.status = TaskStatus.FAILED
-                    task.completed_at = time.time()
-                    
-                    span.set_status("ERROR", str(e))
-                    logger.error(f"Task {task.task_id} failed: {e}")
+                if task.is_coroutine:
+                    result = await task.func(*task.args, **task.kwargs)
+                else:
+                    result = task.func(*task.args, **task.kwargs)
                 
-                finally:
-                    # Clean up
-                    if task.task_id in self.running_tasks:
-                        del self.running_tasks[task.task_id]
+                task.result = result
+                self._set_status(task, TaskStatus.COMPLETED)
+                task.completed_at = time.time()
+                
+                span.set_status("OK")
+                
+            except Exception as e:
+                task.error = str(e)
+                self._set_status(task, TaskStatus.FAILED)
+                task.completed_at = time.time()
+                
+                span.set_status("ERROR", str(e))
+                logger.error(f"Task {task.task_id} failed: {e}")
+            
+            finally:
+                # Clean up
+                if task.task_id in self.running_tasks:
+                    del self.running_tasks[task.task_id]
+                if task.completed_at:
+                    self._notify(task)
+                    self._notify_waiters(task)
     
     async def get_task_status(self, task_id: str) -> Optional[TaskStatus]:
         """Get the status of a task"""
         task = self.tasks.get(task_id)
         return task.status if task else None
     
+    async def get_task_statuses(self, task_ids: List[str]) -> Dict[str, TaskStatus]:
+        """Get the status of several tasks in one call"""
+        tasks = self.tasks
+        return {task_id: tasks[task_id].status for task_id in task_ids if task_id in tasks}
+    
+    async def wait_for(self, task_id: str, timeout: Optional[float] = None) -> Optional[TaskStatus]:
+        """Wait for a task to finish and return its final status"""
+        task = self.tasks.get(task_id)
+        if not task:
+            return None
+        
+        if task.status not in _TERMINAL_STATUSES:
+            waiter = self._waiters.get(task_id)
+            if waiter is None:
+                waiter = self._waiters[task_id] = asyncio.get_running_loop().create_future()
+            # asyncio.wait leaves the shared future alone on timeout
+            await asyncio.wait([waiter], timeout=timeout)
+        return task.status
+    
     async def get_task_result(self, task_id: str) -> Any:
         """Get the result of a completed task"""
         task = self.tasks.get(task_id)
@@ -187,40 +343,31 @@ class SimpleTaskManager:
             raise ValueError(f"Task {task_id} is not completed yet")
     
     async def cancel_task(self, task_id: str) -> bool:
-        """Cancel a running task"""
-        if task_id in self.running_tasks:
-            asyncio_task = self.running_tasks[task_id]
-            asyncio_task.cancel()
-            
-            task = self.tasks.get(task_id)
-            if task:
-                task.status = TaskStatus.CANCELLED
-            
-            return True
-        return False
+        """Cancel a queued or running task"""
+        task = self.tasks.get(task_id)
+        if task is None or task.status in _TERMINAL_STATUSES:
+            return False
+        
+        self._set_status(task, TaskStatus.CANCELLED)
+        worker = self.running_tasks.get(task_id)
+        if worker:
+            worker.cancel()
+        # Queued tasks are skipped when a worker dequeues them
+        self._notify(task)
+        self._notify_waiters(task)
+        return True
     
     async def get_all_tasks(self) -> List[Dict[str, Any]]:
         """Get information about all tasks"""
-        return [
-            {
-                "task_id": task.task_id,
-                "request": task.request,
-                "status": task.status,
-                "priority": task.priority,
-                "created_at": task.created_at,
-                "started_at": task.started_at,
-                "completed_at": task.completed_at,
-                "error": task.error
-            }
-            for task in self.tasks.values()
-        ]
+        return [self._task_info(task) for task in self.tasks.values()]
     
-    def list_tasks(self) -> List[Dict]:
-        """Get all tasks as list of dictionaries for API compatibility."""
-        tasks = []
-        for task_id, task in self.tasks.items():
-            tasks.append({
-                "task_id": task_id,
+    @staticmethod
+    def _task_info(task: Task) -> Dict[str, Any]:
+        """JSON-ready view of a task for the API and listeners (shared; do not mutate)"""
+        info = task._info
+        if info is None:
+            info = task._info = {
+                "task_id": task.task_id,
                 "request": task.request,
                 "status": task.status.value,
                 "priority": task.priority.value,
@@ -228,23 +375,40 @@ class SimpleTaskManager:
                 "started_at": task.started_at,
                 "completed_at": task.completed_at,
                 "error": str(task.error) if task.error else None
-            })
-        return tasks
+            }
+        return info
+    
+    async def list_tasks(self, status: Optional[TaskStatus] = None, limit: Optional[int] = None) -> List[Dict]:
+        """Get tasks, newest first, as list of dictionaries for API compatibility."""
+        # Stops scanning once `limit` matches are found
+        tasks = (
+            self._task_info(task)
+            for task in reversed(self.tasks.values())
+            if status is None or task.status == status
+        )
+        return list(itertools.islice(tasks, limit))
     
-    def get_metrics(self) -> Dict:
+    async def get_metrics(self) -> Dict:
         """Get system metrics for API compatibility."""
+        counts = self._status_counts
         total_tasks = len(self.tasks)
-        completed_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.COMPLETED])
-        failed_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.FAILED])
-        running_tasks = len([t for t in self.tasks.values() if t.status == TaskStatus.RUNNING])
+        completed_tasks = counts[TaskStatus.COMPLETED]
+        failed_tasks = counts[TaskStatus.FAILED]
+        running_tasks = counts[TaskStatus.RUNNING]
+        pending_tasks = counts[TaskStatus.PENDING]
         
         return {
             "total_tasks": total_tasks,
+            "pending_tasks": pending_tasks,
             "completed_tasks": completed_tasks,
             "failed_tasks": failed_tasks,
             "running_tasks": running_tasks,
+            # Names used by the dashboard and the health check
+            "executing_tasks": running_tasks,
+            "active_tasks": len(self.running_tasks),
+            "queue_size": pending_tasks,
             "success_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0.0,
-            "uptime": time.time() - self.start_time if hasattr(self, 'start_time') else 0
+            "uptime": time.monotonic() - self._mono_start
         }
 
 
@@ -8,12 +8,25 @@ import asyncio
 import json
 import sys
 import os
+import re
 import time
 from typing import Dict, Any, List
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
+# One pass over the request picks the action; lookaheads keep keywords order-independent
+_ROUTER = re.compile(
+    r"^(?:"
+    r"(?P<create_deployment>(?=.*nginx)(?=.*deployment)(?=.*create))"
+    r"|(?P<scale_deployment>(?=.*nginx)(?=.*deployment)(?=.*scale))"
+    r"|(?P<create_service>(?=.*service)(?=.*nginx))"
+    r"|(?P<list_pods>(?=.*list)(?=.*pod))"
+    r")",
+    re.IGNORECASE | re.DOTALL
+)
+_NUMBER = re.compile(r"\b(\d+)\b")
+
 class DemoTaskManager:
     """Simple task manager for demo purposes"""
     
@@ -43,28 +56,30 @@ class DemoTaskManager:
     
     def _process_task(self, request: str) -> Dict[str, Any]:
         """Process a task request"""
-        request_lower = request.lower()
+        match = _ROUTER.match(request)
+        kind = match.lastgroup if match else None
+        number = _NUMBER.search(request)
+        
+        if kind == "create_deployment":
+            return {
+                "action": "create_deployment",
+                "resource": "nginx",
+                "replicas": int(number.group(1)) if number else 1,
+                "status": "success",
+                "message": "Nginx deployment created successfully"
+            }
         
-        if "nginx" in request_lower and "deployment" in request_lower:
-            if "create" in request_lower:
-                return {
-                    "action": "create_deployment",
-                    "resource": "nginx",
-                    "replicas": 3 if "3" in request else 1,
-                    "status": "success",
-                    "message": "Nginx deployment created successfully"
-                }
-            elif "scale" in request_lower:
-                replicas = 5 if "5" in request else 3
-                return {
-                    "action": "scale_deployment",
-                    "resource": "nginx",
-                    "replicas": replicas,
-                    "status": "success",
-                    "message": f"Nginx deployment scaled to {replicas} replicas"
-                }
+        elif kind == "scale_deployment":
+            replicas = int(number.group(1)) if number else 3
+            return {
+                "action": "scale_deployment",
+                "resource": "nginx",
+                "replicas": replicas,
+                "status": "success",
+                "message": f"Nginx deployment scaled to {replicas} replicas"
+            }
         
-        elif "service" in request_lower and "nginx" in request_lower:
+        elif kind == "create_service":
             return {
                 "action": "create_service",
                 "resource": "nginx",
@@ -73,7 +88,7 @@ class DemoTaskManager:
                 "message": "Service created for nginx deployment"
             }
         
-        elif "list" in request_lower and "pod" in request_lower:
+        elif kind == "list_pods":
             return {
                 "action": "list_pods",
                 "namespace": "default",
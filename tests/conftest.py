@@ -0,0 +1,9 @@
+"""
+Shared pytest configuration for the AutoOps test suite
+"""
+
+
+def pytest_configure(config):
+    # Lets CPU-bound and I/O-bound tests be run separately (see README)
+    config.addinivalue_line("markers", "cpu: CPU-bound tests, suited to xdist process workers")
+    config.addinivalue_line("markers", "io: I/O-bound tests, suited to the shared event loop in one process")
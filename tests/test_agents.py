@@ -3,115 +3,202 @@ Test suite for AutoOps agents
 """
 
 import pytest
+import pytest_asyncio
 import asyncio
-from unittest.mock import Mock, AsyncMock
+import json
+from unittest.mock import Mock
 from datetime import datetime
+from kubernetes.client import Configuration
 
-from src.agents.state import AutoOpsState, TaskStatus, KubernetesAction, ResourceType
+from src.agents.state import (
+    AutoOpsState, ExecutionPlan, KubernetesOperation, TaskStatus, KubernetesAction, ResourceType
+)
 from src.agents.planner import PlannerAgent
 from src.agents.executor import ExecutorAgent
 from src.agents.orchestrator import AutoOpsOrchestrator
+from src.kubernetes.client import KubernetesClient
+from src.utils.task_manager import TaskManager, TaskPriority
+
+
+# Plan returned by the mocked LLM, serialized once at import
+_MOCK_PLAN = {
+    "description": "Deploy nginx with 3 replicas",
+    "operations": [
+        {
+            "action": "CREATE",
+            "resource_type": "deployment",
+            "resource_name": "nginx",
+            "namespace": "default",
+            "manifest": {
+                "apiVersion": "apps/v1",
+                "kind": "Deployment",
+                "metadata": {"name": "nginx"},
+                "spec": {"replicas": 3}
+            }
+        }
+    ],
+    "estimated_duration": 60
+}
+_MOCK_PLAN_JSON = json.dumps(_MOCK_PLAN)
+
+# Prototype operation and plan; cases derive variants with model_copy, which skips validation
+_OP_CREATE = KubernetesOperation(
+    action=KubernetesAction.CREATE,
+    resource_type=ResourceType.DEPLOYMENT,
+    resource_name="test",
+    namespace="default"
+)
+_PLAN = ExecutionPlan(description="Test plan", operations=[_OP_CREATE])
+
+# (plan, first expected issue) pairs for test_plan_validation, built once at import
+_VALIDATION_CASES = [
+    pytest.param(
+        _PLAN.model_copy(update={"operations": [_OP_CREATE.model_copy(update={"namespace": "non-existent"})]}),
+        "Namespace 'non-existent' not created before use",
+        id="missing-namespace"
+    ),
+    pytest.param(
+        _PLAN.model_copy(update={"operations": [_OP_CREATE, _OP_CREATE]}),
+        "Duplicate resource creation: default/deployment/test",
+        id="duplicate-create"
+    ),
+]
+
+# (operation, client method it calls) pairs for test_execute_operations
+_EXECUTION_CASES = [
+    pytest.param(
+        _OP_CREATE.model_copy(update={"manifest": {"test": "manifest"}}),
+        "create_resource",
+        id="create"
+    ),
+    pytest.param(
+        _OP_CREATE.model_copy(update={"action": KubernetesAction.DELETE}),
+        "delete_resource",
+        id="delete"
+    ),
+]
+
+# Every test and async fixture shares one session-wide event loop
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session", autouse=True)
+async def eager_tasks():
+    """Run new tasks eagerly, so ones that finish without suspending skip the scheduler (3.12+)"""
+    if hasattr(asyncio, "eager_task_factory"):
+        asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    yield
+
+
+# Validated once; each test gets a deep copy, which pydantic makes without re-validating
+_SAMPLE_STATE = AutoOpsState(
+    original_request="Deploy nginx with 3 replicas"
+)
 
 
 @pytest.fixture
 def sample_state():
     """Create a sample AutoOps state for testing"""
-    return AutoOpsState(
-        original_request="Deploy nginx with 3 replicas"
-    )
+    return _SAMPLE_STATE.model_copy(deep=True)
+
+
+# Agents are built once per module; tests patch them through monkeypatch so every
+# patch is undone before the next test
+
+
+@pytest.fixture(scope="module")
+def planner():
+    return PlannerAgent()
+
+
+@pytest.fixture(scope="module")
+def executor():
+    return ExecutorAgent()
+
+
+@pytest.fixture(scope="module")
+def orchestrator():
+    return AutoOpsOrchestrator()
+
+
+@pytest.fixture(scope="module")
+def k8s_client():
+    # API methods are patched per test, so no cluster configuration is loaded
+    return KubernetesClient(configuration=Configuration())
+
+
+# Read-only mocks are built once per session; spec_set keeps Mock from growing child mocks
+
+
+@pytest.fixture(scope="session")
+def llm_plan_response():
+    """LLM response whose content is a single-deployment plan"""
+    return Mock(spec_set=["content"], content=_MOCK_PLAN_JSON)
+
+
+class _CreatedDeployment:
+    """Kubernetes API object returned by a create call; a plain fake, not a Mock"""
+    
+    __slots__ = ()
+    
+    @staticmethod
+    def to_dict():
+        return {"status": "created"}
+
 
+def _async_return(value):
+    """Coroutine function stub returning value; use AsyncMock only where calls are asserted"""
+    async def stub(*args, **kwargs):
+        return value
+    return stub
 
-@pytest.mark.asyncio
+
+@pytest.mark.cpu
 class TestPlannerAgent:
     """Test cases for the Planner Agent"""
     
-    async def test_plan_simple_deployment(self, sample_state):
+    async def test_plan_simple_deployment(self, planner, llm_plan_response, monkeypatch):
         """Test planning a simple deployment"""
-        planner = PlannerAgent()
-        
-        # Mock the LLM response
-        mock_response = Mock()
-        mock_response.content = '''
-        {
-            "description": "Deploy nginx with 3 replicas",
-            "operations": [
-                {
-                    "action": "CREATE",
-                    "resource_type": "deployment",
-                    "resource_name": "nginx",
-                    "namespace": "default",
-                    "manifest": {
-                        "apiVersion": "apps/v1",
-                        "kind": "Deployment",
-                        "metadata": {"name": "nginx"},
-                        "spec": {"replicas": 3}
-                    }
-                }
-            ],
-            "estimated_duration": 60
-        }
-        '''
+        # aplan sends its prompt to the shared LLM through the prompt batcher
+        monkeypatch.setattr(planner._batcher, "submit", _async_return(llm_plan_response))
         
-        planner.llm.ainvoke = AsyncMock(return_value=mock_response)
+        steps = await planner.aplan("Deploy nginx with 3 replicas", cache_bypass=True)
         
-        result = await planner.plan(sample_state)
-        
-        assert result.planner_state.status == TaskStatus.COMPLETED
-        assert result.execution_plan is not None
-        assert len(result.execution_plan.operations) == 1
-        assert result.execution_plan.operations[0].action == KubernetesAction.CREATE
-        assert result.execution_plan.operations[0].resource_type == ResourceType.DEPLOYMENT
+        assert len(steps) == 1
+        assert steps[0].action == KubernetesAction.CREATE.value
+        assert steps[0].resource_type == ResourceType.DEPLOYMENT.value
+        assert steps[0].resource_name == "nginx"
+        assert steps[0].manifest["spec"]["replicas"] == 3
     
-    async def test_plan_validation(self, sample_state):
+    @pytest.mark.parametrize("plan,expected_issue", _VALIDATION_CASES)
+    async def test_plan_validation(self, planner, plan, expected_issue):
         """Test plan validation"""
-        planner = PlannerAgent()
-        
-        # Create a plan with issues
-        from src.agents.state import ExecutionPlan, KubernetesOperation
-        
-        plan = ExecutionPlan(
-            description="Test plan",
-            operations=[
-                KubernetesOperation(
-                    action=KubernetesAction.CREATE,
-                    resource_type=ResourceType.DEPLOYMENT,
-                    resource_name="test",
-                    namespace="non-existent"
-                )
-            ]
-        )
-        
         issues = await planner.validate_plan(plan)
         assert len(issues) > 0
-        assert "Namespace 'non-existent' not created before use" in issues[0]
+        assert expected_issue in issues[0]
+    
+    async def test_plan_validation_concurrent(self, planner):
+        """Validating several plans at once gives each its own issues"""
+        cases = [case.values for case in _VALIDATION_CASES]
+        results = await asyncio.gather(*(planner.validate_plan(plan) for plan, _ in cases))
+        
+        for (_, expected_issue), issues in zip(cases, results):
+            assert len(issues) > 0
+            assert expected_issue in issues[0]
 
 
-@pytest.mark.asyncio
+@pytest.mark.io
 class TestExecutorAgent:
     """Test cases for the Executor Agent"""
     
-    async def test_execute_operations(self, sample_state):
+    @pytest.mark.parametrize("operation,client_method", _EXECUTION_CASES)
+    async def test_execute_operations(self, executor, sample_state, monkeypatch, operation, client_method):
         """Test executing operations"""
-        executor = ExecutorAgent()
-        
         # Mock Kubernetes client
-        executor.k8s_client.create_resource = AsyncMock(return_value={"status": "success"})
+        monkeypatch.setattr(executor.k8s_client, client_method, _async_return({"status": "success"}))
         
         # Create execution plan
-        from src.agents.state import ExecutionPlan, KubernetesOperation
-        
-        sample_state.execution_plan = ExecutionPlan(
-            description="Test execution",
-            operations=[
-                KubernetesOperation(
-                    action=KubernetesAction.CREATE,
-                    resource_type=ResourceType.DEPLOYMENT,
-                    resource_name="test",
-                    namespace="default",
-                    manifest={"test": "manifest"}
-                )
-            ]
-        )
+        sample_state.execution_plan = _PLAN.model_copy(update={"operations": [operation]})
         
         result = await executor.execute(sample_state)
         
@@ -120,32 +207,15 @@ class TestExecutorAgent:
         assert result.execution_results[0].status == TaskStatus.COMPLETED
 
 
-@pytest.mark.asyncio
+@pytest.mark.io
 class TestOrchestrator:
     """Test cases for the AutoOps Orchestrator"""
     
-    async def test_process_request(self):
+    async def test_process_request(self, orchestrator, monkeypatch):
         """Test processing a complete request"""
-        orchestrator = AutoOpsOrchestrator()
-        
-        # Mock agents
-        orchestrator.planner.plan = AsyncMock()
-        orchestrator.executor.execute = AsyncMock()
-        
         # Mock successful planning
         async def mock_plan(state):
-            from src.agents.state import ExecutionPlan, KubernetesOperation
-            state.execution_plan = ExecutionPlan(
-                description="Mock plan",
-                operations=[
-                    KubernetesOperation(
-                        action=KubernetesAction.CREATE,
-                        resource_type=ResourceType.DEPLOYMENT,
-                        resource_name="test",
-                        namespace="default"
-                    )
-                ]
-            )
+            state.execution_plan = _PLAN.model_copy()
             state.planner_state.status = TaskStatus.COMPLETED
             return state
         
@@ -154,8 +224,9 @@ class TestOrchestrator:
             state.executor_state.status = TaskStatus.COMPLETED
             return state
         
-        orchestrator.planner.plan = mock_plan
-        orchestrator.executor.execute = mock_execute
+        # Mock agents
+        monkeypatch.setattr(orchestrator.planner, "plan", mock_plan)
+        monkeypatch.setattr(orchestrator.executor, "execute", mock_execute)
         
         result = await orchestrator.process_request("Deploy test application")
         
@@ -163,67 +234,56 @@ class TestOrchestrator:
         assert not result.is_failed()
 
 
-@pytest.mark.asyncio
+@pytest.mark.io
 class TestTaskManager:
     """Test cases for the Task Manager"""
     
-    async def test_submit_task(self):
-        """Test task submission"""
-        from src.utils.task_manager import TaskManager, TaskPriority
-        
+    @pytest_asyncio.fixture(scope="class", loop_scope="session")
+    async def task_manager(self):
+        """One started task manager shared by the tests in this class"""
+        # These tests cover submission and metrics only, so no worker consumes the queue
         task_manager = TaskManager()
-        await task_manager.start(num_workers=1)
-        
+        await task_manager.start(num_workers=0)
         try:
-            task_id = await task_manager.submit_task(
-                request="Test request",
-                priority=TaskPriority.NORMAL
-            )
-            
-            assert task_id is not None
-            
-            # Check task status
-            status = await task_manager.get_task_status(task_id)
-            assert status is not None
-            assert status['status'] in ['pending', 'executing']
-            
+            yield task_manager
         finally:
             await task_manager.stop()
     
-    async def test_task_metrics(self):
-        """Test task metrics"""
-        from src.utils.task_manager import TaskManager
+    async def test_submit_task(self, task_manager):
+        """Test task submission"""
+        task_id = await task_manager.submit_task(
+            request="Test request",
+            priority=TaskPriority.NORMAL
+        )
         
-        task_manager = TaskManager()
-        await task_manager.start(num_workers=1)
+        assert task_id is not None
         
-        try:
-            metrics = await task_manager.get_metrics()
-            
-            assert 'total_tasks' in metrics
-            assert 'pending_tasks' in metrics
-            assert 'executing_tasks' in metrics
-            assert 'completed_tasks' in metrics
-            assert 'failed_tasks' in metrics
-            
-        finally:
-            await task_manager.stop()
+        # No wait needed: until the write-behind flush runs, the status is read from the
+        # manager's own unflushed state, so this sees the task as just submitted
+        status = await task_manager.get_task_status(task_id)
+        assert status is not None
+        assert status['status'] in ['pending', 'executing']
+    
+    async def test_task_metrics(self, task_manager):
+        """Test task metrics"""
+        metrics = await task_manager.get_metrics()
+        
+        assert 'total_tasks' in metrics
+        assert 'pending_tasks' in metrics
+        assert 'executing_tasks' in metrics
+        assert 'completed_tasks' in metrics
+        assert 'failed_tasks' in metrics
 
 
-@pytest.mark.asyncio
+@pytest.mark.io
 class TestKubernetesClient:
     """Test cases for Kubernetes Client"""
     
-    async def test_create_resource(self):
+    async def test_create_resource(self, k8s_client, monkeypatch):
         """Test resource creation (mocked)"""
-        from src.kubernetes.client import KubernetesClient
-        
-        client = KubernetesClient()
-        
-        # Mock the Kubernetes API client
-        client.apps_v1.create_namespaced_deployment = Mock(
-            return_value=Mock(to_dict=lambda: {"status": "created"})
-        )
+        # Mock the Kubernetes API client; drop any method resolved by an earlier test
+        monkeypatch.setattr(k8s_client.apps_v1, "create_namespaced_deployment", lambda *args, **kwargs: _CreatedDeployment())
+        monkeypatch.setattr(k8s_client, "_resolved", {})
         
         manifest = {
             "apiVersion": "apps/v1",
@@ -232,7 +292,7 @@ class TestKubernetesClient:
             "spec": {"replicas": 1}
         }
         
-        result = await client.create_resource(
+        result = await k8s_client.create_resource(
             resource_type="deployment",
             namespace="default",
             manifest=manifest
@@ -0,0 +1,40 @@
+"""
+Micro-benchmarks for the objects the test suite and task manager build repeatedly
+"""
+
+import pytest
+import asyncio
+from unittest.mock import Mock, AsyncMock
+
+pytest.importorskip("pytest_benchmark")
+
+from src.agents.planner import PlannerAgent
+from src.utils.task_manager import TaskManager
+
+
+async def _start_stop():
+    task_manager = TaskManager()
+    await task_manager.start(num_workers=1)
+    await task_manager.stop()
+
+
+@pytest.mark.cpu
+class TestConstructionCost:
+    """Construction costs that the rest of the suite pays per test"""
+    
+    def test_mock(self, benchmark):
+        benchmark(Mock)
+    
+    def test_async_mock(self, benchmark):
+        benchmark(AsyncMock)
+    
+    def test_planner_agent(self, benchmark):
+        benchmark(PlannerAgent)
+
+
+@pytest.mark.io
+class TestTaskManagerLifecycle:
+    """Start/stop round-trip of a task manager with one worker"""
+    
+    def test_start_stop(self, benchmark):
+        benchmark(lambda: asyncio.run(_start_stop()))